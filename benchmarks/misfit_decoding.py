@@ -0,0 +1,48 @@
+"""
+Compares payload size and decode time of the `compute/misfits` response
+in CSV and in parquet, for both univariate misfits (realizations x
+observations) and summary misfits (one value per realization).
+
+    python benchmarks/misfit_decoding.py [realizations] [observations]
+"""
+
+import io
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from webviz_ert.data_loader import _decode_misfits
+
+
+def _payloads(df: pd.DataFrame) -> dict:
+    parquet = io.BytesIO()
+    df.to_parquet(parquet)
+    return {"csv": df.to_csv().encode(), "parquet": parquet.getvalue()}
+
+
+def main() -> None:
+    realizations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    observations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    univariate = pd.DataFrame(
+        np.random.randn(realizations, observations) ** 3,
+        columns=[str(x) for x in range(observations)],
+    )
+    summary = pd.DataFrame({"0": univariate.abs().sum(axis=1)})
+    print(f"{realizations} realizations x {observations} observations")
+    for name, df in (
+        ("univariate_misfits_df", univariate),
+        ("summary_misfits_df", summary),
+    ):
+        for fmt, content in _payloads(df).items():
+            runs = 5
+            seconds = timeit.timeit(lambda: _decode_misfits(content), number=runs)
+            print(
+                f"{name:>22} {fmt:>8}: {len(content) / 1024:10.0f} kB, "
+                f"{1000 * seconds / runs:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares peak memory and wall time of decoding a response record payload
+with pandas (`read_parquet` + `transpose` + `sort_index`) and with the
+arrow-native path used by the DataLoader.
+
+The payload is written to a temporary file and each decoder runs in a
+fresh interpreter, so the reported peak resident set size only reflects
+that decoder.
+
+    python benchmarks/record_decoding.py [timesteps] [realizations]
+"""
+
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _write_payload(path: str, timesteps: int, realizations: int) -> None:
+    # Stored the way ERT storage serves responses: one row per realization
+    df = pd.DataFrame(
+        np.random.rand(realizations, timesteps),
+        columns=[str(step) for step in range(timesteps)],
+        index=[str(real) for real in range(realizations)],
+    )
+    df.to_parquet(path)
+
+
+def _decode_pandas(content: bytes) -> pd.DataFrame:
+    df = pd.read_parquet(io.BytesIO(content)).transpose()
+    df.index = df.index.astype(int)
+    return df.sort_index()
+
+
+def _decode_arrow(content: bytes) -> pd.DataFrame:
+    from webviz_ert.data_loader._arrow import read_transposed_parquet
+
+    df = read_transposed_parquet(content)
+    df.index = df.index.astype(int)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df
+
+
+def _run(decoder: str, path: str) -> None:
+    with open(path, "rb") as f:
+        content = f.read()
+    decode = {"pandas": _decode_pandas, "arrow": _decode_arrow}[decoder]
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = decode(content)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "decoder": decoder,
+                "seconds": elapsed,
+                "peak_mb": (peak - baseline) / 1024,
+                "frame_mb": df.memory_usage().sum() / 1024**2,
+                "payload_mb": len(content) / 1024**2,
+            }
+        )
+    )
+
+
+def main() -> None:
+    timesteps = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    realizations = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    print(f"{timesteps} timesteps x {realizations} realizations")
+    with tempfile.NamedTemporaryFile(suffix=".parquet") as payload:
+        _write_payload(payload.name, timesteps, realizations)
+        for decoder in ("pandas", "arrow"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--run", decoder, payload.name],
+                stdout=subprocess.PIPE,
+                check=True,
+            )
+            result = json.loads(out.stdout)
+            print(
+                f"{result['decoder']:>7}: {result['seconds']:.2f}s, "
+                f"peak +{result['peak_mb']:.0f} MB "
+                f"(frame {result['frame_mb']:.0f} MB, "
+                f"payload {result['payload_mb']:.0f} MB)"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--run":
+        _run(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -1,3 +1,4 @@
+import json
 import pytest
 import pandas as pd
 from requests import HTTPError
@@ -24,12 +25,15 @@ def mock_data(mocker):
 
     mocker.patch("webviz_ert.data_loader._requests_get", side_effect=_requests_get)
     mocker.patch("webviz_ert.data_loader._requests_post", side_effect=_requests_post)
+    yield
+    DataLoader._instances.clear()
 
 
 class _MockResponse:
-    def __init__(self, url, data, status_code):
+    def __init__(self, url, data, status_code, headers=None):
         self.data = data
         self.status_code = status_code
+        self.headers = headers or {}
 
     def json(self):
         return self.data
@@ -44,7 +48,9 @@ class _MockResponse:
 
     @property
     def content(self):
-        return self.data
+        if isinstance(self.data, bytes):
+            return self.data
+        return json.dumps(self.data).encode()
 
     def raise_for_status(self):
         if self.status_code == 400:
@@ -64,7 +70,7 @@ def _requests_get(url, **kwargs):
     return _MockResponse(url, {}, 400)
 
 
-from webviz_ert.data_loader import GET_ENSEMBLE
+from webviz_ert.data_loader import GET_ENSEMBLE, DataLoader
 
 
 def _requests_post(url, **kwargs):
@@ -79,6 +85,28 @@ def _requests_post(url, **kwargs):
     return _MockResponse(url, {}, 400)
 
 
+def _range_requests_get(content, sent):
+    """Serves HTTP range requests for one payload, recording the bytes sent"""
+
+    def _requests_get(url, headers, **kwargs):
+        if "Range" not in headers:
+            sent.append(len(content))
+            return _MockResponse(url, content, 200)
+        first, last = headers["Range"][len("bytes=") :].split("-")
+        if not first:
+            first, last = len(content) - int(last), len(content) - 1
+        part = content[int(first) : int(last) + 1]
+        sent.append(len(part))
+        return _MockResponse(
+            url,
+            part,
+            206,
+            headers={"Content-Range": f"bytes {first}-{last}/{len(content)}"},
+        )
+
+    return _requests_get
+
+
 def select_first(dash_duo, selector):
     parameter_selector_input = dash_duo.find_element(selector)
     options = parameter_selector_input.text.split("\n")
@@ -3,6 +3,7 @@ from webviz_ert.controllers.controller_functions import (
     response_options,
     _valid_response_option,
 )
+from webviz_ert.controllers.multi_response_controller import _get_x_window
 
 
 def test_response_options(mock_data):
@@ -59,3 +60,15 @@ def test_valid_response_option():
     response.name = "DummyResponseH"
     response.has_observations = False
     assert _valid_response_option(response_filters, response) is False
+
+
+def test_get_x_window():
+    assert _get_x_window(None) is None
+    assert _get_x_window({"autosize": True}) is None
+    assert _get_x_window({"yaxis.range[0]": 0, "yaxis.range[1]": 1}) is None
+    assert _get_x_window({"xaxis.autorange": True}) == (None, None)
+    assert _get_x_window({"xaxis.range[0]": 2, "xaxis.range[1]": 8}) == (2, 8)
+    assert _get_x_window({"xaxis.range": ["2010-01-01", "2011-01-01"]}) == (
+        "2010-01-01",
+        "2011-01-01",
+    )
@@ -17,33 +17,35 @@ ensembles_response = {
         "data": {
             "experiments": [
                 {
+                    "id": "exp1_id",
                     "name": "exp1",
                     "ensembles": [
                         {
-                            "children": [
-                                2,
-                            ],
-                            "name": "default",
+                            "children": [{"ensembleResult": {"id": 2}}],
                             "parent": None,
                             "id": 1,
-                            "time_created": "2020-04-29T09:36:26",
+                            "timeCreated": "2020-04-29T09:36:26",
+                            "size": 1,
+                            "activeRealizations": [0],
+                            "userdata": '{"name": "default"}',
                         },
                         {
                             "children": [],
-                            "name": "default_smoother_update",
-                            "parent": {
-                                "name": "default",
-                                "id": 1,
-                            },
+                            "parent": {"ensembleReference": {"id": 1}},
                             "id": 2,
-                            "time_created": "2020-04-29T09:43:25",
+                            "timeCreated": "2020-04-29T10:36:26",
+                            "size": 1,
+                            "activeRealizations": [0],
+                            "userdata": '{"name": "default_smoother_update"}',
                         },
                         {
                             "children": [],
-                            "name": "nr_42",
                             "parent": None,
                             "id": 42,
-                            "time_created": "2021-04-29T09:43:25",
+                            "timeCreated": "2020-04-29T09:36:26",
+                            "size": 1,
+                            "activeRealizations": [0],
+                            "userdata": '{"name": "nr_42"}',
                         },
                     ],
                 }
@@ -361,3 +363,12 @@ ensembles_response[
         index=["0", "1", "2"],
     ).transpose()
 )
+ensembles_response[
+    "http://127.0.0.1:5000/ensembles/42/records/test_parameter_2?"
+] = to_parquet_helper(
+    pd.DataFrame(
+        [[0.01, 0.02], [1.01, 1.02], [2.01, 2.02]],
+        columns=["a", "b"],
+        index=["0", "1", "2"],
+    ).transpose()
+)
@@ -1,8 +1,22 @@
+import gc
+import time
 from webviz_ert.models import EnsembleModel
 import dash
 from webviz_ert.plugins import ParameterComparison
 from webviz_ert.plugins import ObservationAnalyzer
 from webviz_ert.models import load_ensemble
+from webviz_ert.data_loader import get_ensemble_catalogue
+import webviz_ert.data_loader
+import webviz_ert.models
+import webviz_ert.models.experiment_model
+import webviz_ert.plugins._webviz_ert
+import webviz_ert.data_loader._prefetch as prefetch
+from webviz_ert.models import (
+    EnsembleEntry,
+    get_experiment,
+    load_catalogue,
+    prefetch_ensemble,
+)
 
 
 def test_ensemble_model(mock_data):
@@ -83,3 +97,273 @@ def test_ensemble_caching(mock_data):
     plotter_view.clear_ensembles()
     assert len(page_obs_analyzer_ensembles) == 0
     assert len(plotter_view_ensembles) == 0
+
+
+def test_ensemble_model_from_catalogue(mock_data):
+    catalogue = get_ensemble_catalogue()
+    assert [schema["id"] for schema in catalogue] == [1, 2, 42]
+    assert webviz_ert.data_loader._requests_post.call_count == 1
+
+    models = [
+        EnsembleModel(ensemble_id=schema["id"], project_id=None, schema=schema)
+        for schema in catalogue
+    ]
+    assert webviz_ert.data_loader._requests_post.call_count == 1
+    assert [model.name for model in models] == [
+        "default",
+        "default_smoother_update",
+        "nr_42",
+    ]
+    assert models[1].parent.id == 1
+
+
+def test_ensemble_model_parameters_df_fetches_concurrently(mock_data, mocker):
+    ens_model = EnsembleModel(ensemble_id=42, project_id=None)
+    run_concurrently = mocker.spy(ens_model._data_loader, "run_concurrently")
+    parameter_list = ["test_parameter_1", "test_parameter_2::a"]
+
+    df = ens_model.parameters_df(parameter_list)
+    assert list(df.columns) == parameter_list
+    assert df["test_parameter_1"].tolist() == [0.1, 1.1, 2.1]
+    assert df["test_parameter_2::a"].tolist() == [0.01, 1.01, 2.01]
+    assert len(run_concurrently.call_args[0][0]) == 2
+
+    requests_made = webviz_ert.data_loader._requests_get.call_count
+    ens_model.parameters_df(parameter_list)
+    assert run_concurrently.call_args[0][0] == []
+    assert webviz_ert.data_loader._requests_get.call_count == requests_made
+
+
+def test_ensemble_model_labelled_parameters_share_group_fetch(mock_data):
+    ens_model = EnsembleModel(ensemble_id=42, project_id=None)
+    parameters = ens_model.parameters
+    requests_get = webviz_ert.data_loader._requests_get
+    requests_made = requests_get.call_count
+
+    data = parameters["test_parameter_2::a"].data_df()
+    assert data["a"].values.tolist() == [0.01, 1.01, 2.01]
+    assert data.index.name == "test_parameter_2::a"
+    assert requests_get.call_count == requests_made + 1
+    assert parameters["test_parameter_2::b"].is_loaded
+
+    data = parameters["test_parameter_2::b"].data_df()
+    assert data["b"].values.tolist() == [0.02, 1.02, 2.02]
+    assert data.index.name == "test_parameter_2::b"
+    assert requests_get.call_count == requests_made + 1
+
+
+def test_prefetch_ensemble(mock_data, monkeypatch):
+    monkeypatch.setattr(prefetch, "FOREGROUND_QUIET_SECONDS", 0.0)
+    ensemble = EnsembleModel(ensemble_id=1, project_id=None)
+    prefetcher = ensemble._data_loader.prefetcher
+    prefetch_ensemble(ensemble)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = prefetcher.stats()
+        if stats["completed"] + stats["failed"] == stats["queued"] > 2:
+            break
+        time.sleep(0.01)
+    response = ensemble.responses["SNAKE_OIL_GPR_DIFF"]
+    assert response._data is not None
+    assert ensemble._parameters is not None
+    assert prefetcher.stats()["hits"] == 1
+
+    response.data
+    ensemble.parameters
+    assert prefetcher.stats()["hits"] == 3
+    assert prefetcher.most_viewed(1) == ["SNAKE_OIL_GPR_DIFF"]
+
+
+def test_ensemble_data_is_evicted_over_memory_budget(mock_data):
+    ensembles = [EnsembleModel(ensemble_id=1, project_id=None)]
+    ensembles.append(EnsembleModel(ensemble_id=2, project_id=None))
+    memory = ensembles[0]._data_loader.memory
+    first, second = [ens.responses["SNAKE_OIL_GPR_DIFF"] for ens in ensembles]
+
+    data = first.data
+    assert ensembles[0].resident_bytes > 0
+    assert ensembles[1].resident_bytes == 0
+    memory.max_bytes = ensembles[0].resident_bytes
+
+    second.data
+    assert first._data is None
+    assert first.name in ensembles[0].responses
+    assert ensembles[0].resident_bytes == 0
+    assert ensembles[1].resident_bytes == memory.stats()["bytes"]
+
+    requests_get = webviz_ert.data_loader._requests_get
+    requests_made = requests_get.call_count
+    assert first.data.equals(data)
+    assert requests_get.call_count > requests_made
+    assert second._data is None
+    assert memory.stats()["evictions"] == 2
+
+    memory.max_bytes = 0
+    parameters = EnsembleModel(ensemble_id=42, project_id=None).parameters
+    parameters["test_parameter_2::a"].data_df()
+    parameters["test_parameter_2::a"].evict("data")
+    assert not parameters["test_parameter_2::a"].is_loaded
+    assert parameters["test_parameter_2::a"].data_df()["a"].values.tolist() == [
+        0.01,
+        1.01,
+        2.01,
+    ]
+
+
+def test_cleared_ensembles_release_their_memory(mock_data):
+    app = dash.Dash(__name__)
+    plotter_view = ParameterComparison(app, project_identifier=None)
+    plotter_view.clear_ensembles()
+    ensemble = load_ensemble(plotter_view, ensemble_id=1)
+    response = ensemble.responses["SNAKE_OIL_GPR_DIFF"]
+    response.data
+    memory = ensemble._data_loader.memory
+    assert memory.resident_bytes() == {"1": ensemble.resident_bytes}
+
+    plotter_view.clear_ensembles()
+    assert response._data is None
+    assert memory.resident_bytes() == {}
+
+    # Models dropped without being unregistered are not kept alive either
+    EnsembleModel(ensemble_id=1, project_id=None).responses["SNAKE_OIL_GPR_DIFF"].data
+    gc.collect()
+    assert memory.resident_bytes() == {}
+    assert memory.stats()["bytes"] == 0
+
+
+def test_catalogue_entries_are_promoted_on_selection(mock_data):
+    app = dash.Dash(__name__)
+    plotter_view = ParameterComparison(app, project_identifier=None)
+    plotter_view.clear_ensembles()
+
+    entries = load_catalogue(plotter_view)
+    assert [(entry.id, entry.name) for entry in entries] == [
+        (1, "default"),
+        (2, "default_smoother_update"),
+        (42, "nr_42"),
+    ]
+    assert entries[0].children_ids == (2,)
+    assert entries[1].parent_id == 1
+    assert isinstance(entries[0], tuple)
+    assert load_catalogue(plotter_view) == entries
+    assert len(plotter_view.get_ensembles()) == 0
+    assert webviz_ert.data_loader._requests_post.call_count == 1
+
+    ensemble = load_ensemble(plotter_view, ensemble_id=2)
+    assert webviz_ert.data_loader._requests_post.call_count == 1
+    assert list(plotter_view.get_ensembles()) == [2]
+    assert ensemble.name == "default_smoother_update"
+    assert ensemble.parent.id == 1
+    assert EnsembleEntry.from_schema(entries[1].schema()) == entries[1]
+    plotter_view.clear_ensembles()
+
+
+def test_lineage_resolves_to_registered_ensembles(mock_data):
+    app = dash.Dash(__name__)
+    plotter_view = ParameterComparison(app, project_identifier=None)
+    plotter_view.clear_ensembles()
+    load_catalogue(plotter_view)
+
+    lineage = plotter_view.get_lineage()
+    assert lineage.chains() == [[1, 2], [42]]
+    assert lineage.chain(1) == [1, 2]
+    assert lineage.iteration(2) == 1
+    assert lineage.parent(2) == 1
+    assert lineage.children(1) == (2,)
+
+    update = load_ensemble(plotter_view, ensemble_id=2)
+    prior = update.parent
+    assert prior is load_ensemble(plotter_view, ensemble_id=1)
+    assert prior.children[0] is update
+    assert webviz_ert.data_loader._requests_post.call_count == 1
+
+    # Registered models follow the lineage of a refreshed catalogue
+    other = load_ensemble(plotter_view, ensemble_id=42)
+    assert other.parent is None
+    entries = list(plotter_view.get_catalogue().values())
+    plotter_view.set_catalogue(
+        [
+            entries[0],
+            entries[1]._replace(children_ids=(42,)),
+            entries[2]._replace(parent_id=2),
+        ]
+    )
+    assert other.parent is update
+    assert update.children == [other]
+    plotter_view.clear_ensembles()
+
+
+def test_ensembles_share_experiment_observations_and_priors(mock_data):
+    prior = EnsembleModel(ensemble_id=1, project_id=None)
+    update = EnsembleModel(ensemble_id=2, project_id=None)
+    assert prior._experiment is update._experiment
+    assert prior._experiment is get_experiment("exp1_id", project_id=None)
+
+    observations = [
+        ens.responses["SNAKE_OIL_GPR_DIFF"].observations for ens in (prior, update)
+    ]
+    assert observations[0] is observations[1]
+    tables = [
+        ens.responses["SNAKE_OIL_GPR_DIFF"].observation_table for ens in (prior, update)
+    ]
+    assert tables[0] is tables[1]
+    requested = [
+        call[0][0] for call in webviz_ert.data_loader._requests_get.call_args_list
+    ]
+    assert len([url for url in requested if url.endswith("/observations")]) == 1
+
+    priors = prior._experiment.priors
+    assert prior._experiment.priors is priors
+    parameter = prior.parameters["BPR_138_PERSISTENCE"]
+    assert parameter.priors is priors["BPR_138_PERSISTENCE"]
+    assert priors["BPR_138_PERSISTENCE"].function == "UNIFORM"
+
+
+def test_registries_are_reset_after_fork(mock_data):
+    app = dash.Dash(__name__)
+    plotter_view = ParameterComparison(app, project_identifier=None)
+    plotter_view.clear_ensembles()
+    load_catalogue(plotter_view)
+    ensemble = load_ensemble(plotter_view, ensemble_id=1)
+    ensemble.responses["SNAKE_OIL_GPR_DIFF"].observations
+    webviz_ert.models.indexes_to_axis(["2010-01-01", "2010-01-02"])
+    assert len(webviz_ert.models._parsed_axes) == 1
+
+    for reset_after_fork in (
+        webviz_ert.data_loader._reset_after_fork,
+        webviz_ert.models._reset_after_fork,
+        webviz_ert.models.experiment_model._reset_after_fork,
+        webviz_ert.plugins._webviz_ert._reset_after_fork,
+    ):
+        reset_after_fork()
+    assert not plotter_view.get_ensembles()
+    assert not plotter_view.get_catalogue()
+    assert len(webviz_ert.models._parsed_axes) == 0
+    assert get_experiment("exp1_id", project_id=None) is not ensemble._experiment
+    assert load_ensemble(plotter_view, ensemble_id=1)._data_loader is not (
+        ensemble._data_loader
+    )
+
+
+def test_failed_experiment_fetches_are_retried(mock_data):
+    experiment = get_experiment("exp1_id", project_id=None)
+    assert experiment.observations("NOT_A_RESPONSE", 1) == []
+    assert len(experiment.observation_table("NOT_A_RESPONSE", 1).values) == 0
+    assert "NOT_A_RESPONSE" not in experiment._observations
+    assert "NOT_A_RESPONSE" not in experiment._observation_tables
+
+    app = dash.Dash(__name__)
+    plotter_view = ParameterComparison(app, project_identifier=None)
+    plotter_view.clear_ensembles()
+    assert get_experiment("exp1_id", project_id=None) is not experiment
+
+
+def test_labelled_parameters_do_not_rename_shared_frames(mock_data):
+    ens_model = EnsembleModel(ensemble_id=42, project_id=None)
+    parameters = ens_model.parameters
+    first = parameters["test_parameter_2::a"].data_df()
+    second = parameters["test_parameter_2::b"].data_df()
+    assert first.index.name == "test_parameter_2::a"
+    assert second.index.name == "test_parameter_2::b"
+    assert first.index is not second.index
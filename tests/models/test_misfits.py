@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from webviz_ert.models import Observation, Response
+from webviz_ert.models.misfits import univariate_misfits, summary_misfits
+import webviz_ert.data_loader
+
+
+def _server_misfits(data, x_axis, values, errors, summary):
+    # Reference implementation of ERT storage's compute/misfits
+    observation = pd.DataFrame(data={"values": values, "errors": errors}, index=x_axis)
+    misfits_dict = {}
+    for realization in data.columns:
+        difference = data[realization].loc[observation.index].values - values
+        misfit = (difference / observation["errors"].values) ** 2
+        misfits_dict[int(realization)] = (misfit * np.sign(difference)).tolist()
+    df = pd.DataFrame(data=misfits_dict, index=observation.index)
+    if summary:
+        df = pd.DataFrame([df.abs().sum(axis=0)], columns=df.columns, index=[0])
+    return df.T
+
+
+def test_univariate_misfits_match_server():
+    data = pd.DataFrame(
+        np.random.rand(10, 5) * 10,
+        index=range(10),
+        columns=[str(real) for real in range(5)],
+    )
+    x_axis = [1, 4, 7]
+    values = np.array([2.0, 5.0, 8.0])
+    errors = np.array([0.5, 1.0, 2.0])
+    observation = Observation(
+        {
+            "name": "FOPR",
+            "x_axis": x_axis,
+            "values": values.tolist(),
+            "errors": errors.tolist(),
+        }
+    )
+
+    univariate = univariate_misfits(data, [observation])
+    expected = _server_misfits(data, x_axis, values, errors, summary=False)
+    np.testing.assert_allclose(univariate.values, expected.values)
+    assert univariate.index.tolist() == [0, 1, 2, 3, 4]
+    assert univariate.columns.tolist() == ["1", "4", "7"]
+
+    summary = summary_misfits(univariate)
+    expected = _server_misfits(data, x_axis, values, errors, summary=True)
+    np.testing.assert_allclose(summary.values, expected.values)
+
+
+def test_univariate_misfits_align_dates():
+    dates = pd.date_range("2010-01-01", periods=4)
+    data = pd.DataFrame({"0": [1.0, 2.0, 3.0, 4.0]}, index=dates)
+    observation = Observation(
+        {
+            "name": "FOPR",
+            "x_axis": ["2010-01-02T00:00:00", "2010-01-04T00:00:00"],
+            "values": [1.0, 5.0],
+            "errors": [1.0, 0.5],
+        }
+    )
+    univariate = univariate_misfits(data, [observation])
+    assert univariate.values.tolist() == [[1.0, -4.0]]
+
+    observation._x_axis = ["2011-01-01T00:00:00", "2010-01-04T00:00:00"]
+    assert univariate_misfits(data, [observation]) is None
+
+
+def test_response_misfits_are_computed_locally(mock_data):
+    response = Response(
+        name="SNAKE_OIL_GPR_DIFF",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=1,
+        active_realizations=[0],
+        resp_schema={"id": "id", "name": "name"},
+    )
+    response._observations = [
+        Observation(
+            {
+                "name": "obs",
+                "x_axis": [2, 3],
+                "values": [1.0, 5.0],
+                "errors": [1.0, 2.0],
+            }
+        )
+    ]
+    assert response.univariate_misfits_df().values.tolist() == [[1.0, -1.0]]
+    assert response.summary_misfits_df().values.tolist() == [[2.0]]
+    requested = [
+        call[0][0] for call in webviz_ert.data_loader._requests_get.call_args_list
+    ]
+    assert not [url for url in requested if "compute/misfits" in url]
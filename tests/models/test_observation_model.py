@@ -0,0 +1,63 @@
+import datetime
+import pandas as pd
+from webviz_ert.models import Observation, indexes_to_axis
+from webviz_ert.models.observation import ObservationTable
+
+
+def _observation(x_axis):
+    return Observation(
+        observation_schema={
+            "name": "OBS",
+            "x_axis": x_axis,
+            "errors": [0.1] * len(x_axis),
+            "values": [1.0] * len(x_axis),
+        }
+    )
+
+
+def test_indexes_to_axis_parses_and_interns_dates():
+    dates = ["2010-01-10T00:00:00", "2010-01-20T00:00:00", "2010-02-01T00:00:00"]
+    axis = indexes_to_axis(dates)
+    assert isinstance(axis, pd.DatetimeIndex)
+    assert axis.tolist() == [
+        datetime.datetime(2010, 1, 10),
+        datetime.datetime(2010, 1, 20),
+        datetime.datetime(2010, 2, 1),
+    ]
+    assert indexes_to_axis(list(dates)) is axis
+
+    first, second = _observation(dates), _observation(list(dates))
+    assert first.parsed_x_axis is second.parsed_x_axis
+    assert first.data_df()["x_axis"].tolist() == axis.tolist()
+
+    mixed = indexes_to_axis(["2010-01-10", "2010-01-20T12:00:00+01:00"])
+    assert mixed[1].utcoffset() == datetime.timedelta(hours=1)
+    assert indexes_to_axis(["1", "2"]) == ["1", "2"]
+    assert indexes_to_axis([1, 2]) == [1, 2]
+
+
+def test_observation_table_is_columnar_and_built_once():
+    first = _observation(["2010-01-10", "2010-01-20"])
+    second = Observation(
+        observation_schema={
+            "name": "WOPR",
+            "x_axis": ["2010-02-01"],
+            "errors": [0.5],
+            "values": [3.0],
+            "attributes": {"region": 1},
+        }
+    )
+    table = ObservationTable([first, second])
+    assert len(table) == 3
+    assert table.values.tolist() == [1.0, 1.0, 3.0]
+    assert table.std.tolist() == [0.1, 0.1, 0.5]
+    assert table.key.tolist() == ["OBS", "OBS", "WOPR"]
+    assert table.active.dtype == bool and table.active.all()
+    assert table.attributes.tolist() == ["", "", "region: 1<br>"]
+    assert isinstance(table.x_axis, pd.DatetimeIndex)
+    assert table.x_labels == ["2010-01-10", "2010-01-20", "2010-02-01"]
+
+    df = table.data_df()
+    assert df is table.data_df()
+    assert df["x_axis"].tolist() == table.x_axis.tolist()
+    assert len(ObservationTable([])) == 0
@@ -1,4 +1,13 @@
+import io
+import threading
+import time
 from webviz_ert.models import Response
+import numpy as np
+import pandas as pd
+from tests.conftest import _range_requests_get
+from webviz_ert import data_loader
+from webviz_ert.data_loader import _decode_record_data
+from webviz_ert.models import EnsembleModel, load_response_data
 
 
 def test_response_model(mock_data):
@@ -12,3 +21,137 @@ def test_response_model(mock_data):
     )
     assert resp_model.name == "SNAKE_OIL_GPR_DIFF"
     assert len(resp_model.data.columns) == 1
+
+
+def test_load_response_data(mock_data, mocker):
+    ensembles = [EnsembleModel(ensemble_id=1, project_id=None)]
+    ensembles.append(EnsembleModel(ensemble_id=2, project_id=None))
+    run_concurrently = mocker.spy(
+        ensembles[0]._data_loader.__class__, "run_concurrently"
+    )
+
+    load_response_data(ensembles, ["SNAKE_OIL_GPR_DIFF", "NOT_A_RESPONSE"])
+    assert [len(call[0][1]) for call in run_concurrently.call_args_list] == [2, 4]
+    for ensemble in ensembles:
+        response = ensemble.responses["SNAKE_OIL_GPR_DIFF"]
+        assert response._data is not None
+        assert response._observations is not None
+    assert len(ensembles[0].responses["SNAKE_OIL_GPR_DIFF"].data.columns) == 1
+
+
+def test_response_data_populates_once(mock_data, mocker):
+    resp_model = Response(
+        name="SNAKE_OIL_GPR_DIFF",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=1,
+        active_realizations=[0],
+        resp_schema={"id": "id", "name": "name"},
+    )
+    get_record_data = resp_model._data_loader.get_ensemble_record_data
+
+    def _slow_get_record_data(*args):
+        time.sleep(0.05)
+        return get_record_data(*args)
+
+    slow = mocker.patch.object(
+        resp_model._data_loader,
+        "get_ensemble_record_data",
+        side_effect=_slow_get_record_data,
+    )
+    threads = [threading.Thread(target=lambda: resp_model.data) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert slow.call_count == 1
+
+
+def test_response_data_selection_and_projection(mock_data, mocker):
+    resp_model = Response(
+        name="SNAKE_OIL_GPR_DIFF",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=1,
+        active_realizations=[0],
+        resp_schema={"id": "id", "name": "name"},
+    )
+    requests_get = mocker.spy(data_loader, "_requests_get")
+    x_data = resp_model.data_at(3)
+    assert x_data.name == 3
+    # The mocked server sends whole payloads, so the answer to the footer
+    # request is kept as the response data instead of downloading it again
+    assert not resp_model._data_loader.supports_projection
+    assert resp_model._data is not None
+    assert resp_model.data_at(3).equals(x_data)
+    assert resp_model.data_at(2).name == 2
+    assert requests_get.call_count == 1
+
+    assert resp_model.data_df([0]).equals(resp_model.data.iloc[:, [0]])
+    assert resp_model.data_at(len(resp_model.data.index)).empty
+
+    missing = Response(
+        name="NOT_A_RESPONSE",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=1,
+        active_realizations=[0],
+        resp_schema={"id": "id", "name": "name"},
+    )
+    assert missing.data_at(0).empty
+    assert missing.data_at(0).empty
+
+
+def test_response_data_window(mock_data, mocker):
+    dates = pd.date_range("2010-01-01", periods=1000).strftime("%Y-%m-%d")
+    stored = pd.DataFrame(np.random.rand(5, 1000), columns=dates)
+    buffer = io.BytesIO()
+    stored.to_parquet(buffer)
+    content = buffer.getvalue()
+    mocker.patch(
+        "webviz_ert.data_loader._requests_get",
+        side_effect=_range_requests_get(content, []),
+    )
+    expected = _decode_record_data(content)
+    resp_model = Response(
+        name="FOPR",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=5,
+        active_realizations=list(range(5)),
+        resp_schema={"id": "id", "name": "name"},
+    )
+
+    window = resp_model.data_window("2010-02-01", "2010-02-10 12:00")
+    pd.testing.assert_frame_equal(window, expected.loc["2010-02-01":"2010-02-10"])
+    overview = resp_model.data_window(max_points=100)
+    pd.testing.assert_frame_equal(overview, expected.iloc[::10])
+    assert resp_model._data is None
+
+    # Wider windows load the whole record in one request
+    sent = []
+    mocker.patch(
+        "webviz_ert.data_loader._requests_get",
+        side_effect=_range_requests_get(content, sent),
+    )
+    overview = resp_model.data_window(max_points=500)
+    pd.testing.assert_frame_equal(overview, expected.iloc[::2])
+    assert resp_model._data is not None
+    assert len(sent) == 1
+
+
+def test_response_data_window_without_range_support(mock_data, mocker):
+    resp_model = Response(
+        name="SNAKE_OIL_GPR_DIFF",
+        ensemble_id="1",
+        project_id="",
+        ensemble_size=1,
+        active_realizations=[0],
+        resp_schema={"id": "id", "name": "name"},
+    )
+    requests_get = mocker.spy(data_loader, "_requests_get")
+    window = resp_model.data_window(2, 4)
+    assert window.equals(resp_model.data.iloc[2:5])
+    assert resp_model.data_window(max_points=2).equals(resp_model.data.iloc[::5])
+    # The record sent in answer to the footer request is the one plotted
+    assert requests_get.call_count == 1
@@ -1,6 +1,618 @@
-from webviz_ert.data_loader import get_ensembles
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import dash
+import numpy as np
+import pandas as pd
+import webviz_ert.data_loader
+import webviz_ert.data_loader._cache_directory
+import webviz_ert.data_loader._prefetch as prefetch
+from tests.conftest import _MockResponse, _range_requests_get
+from tests.conftest import _requests_get as mock_requests_get
+from tests.data.snake_oil_data import ensembles_response, to_parquet_helper
+from webviz_ert.data_loader import (
+    DataLoader,
+    _decode_record_data,
+    _reset_after_fork,
+    get_data_loader,
+    get_ensembles,
+    log_metrics_summary,
+    metrics_exposition,
+    start_metrics_log,
+)
+from webviz_ert.data_loader._arrow import read_transposed_parquet
+from webviz_ert.data_loader._cache import LRUCache
+from webviz_ert.data_loader._disk_cache import DiskCache
+from webviz_ert.data_loader._metrics import endpoint_class
+from webviz_ert.data_loader._prefetch import PrefetchScheduler
+from webviz_ert.data_loader._record_store import RecordStore
+from webviz_ert.plugins._webviz_ert import _register_metrics
 
 
 def test_get_ensembles(mock_data):
     ens = get_ensembles()
     assert len(ens) == 3
+
+
+def test_data_loader_reuses_connections():
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b"[]"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    baseurl = f"http://127.0.0.1:{server.server_port}"
+    try:
+        loader = DataLoader(baseurl, pool_size=2, timeout=5)
+        for _ in range(3):
+            assert loader.get_ensemble_parameters("1") == []
+        assert loader.connection_stats() == {
+            "requests": 3,
+            "connections": 1,
+            "reused": 2,
+            "coalesced": 0,
+        }
+    finally:
+        loader.close()
+        DataLoader._instances.pop((baseurl, None))
+        server.shutdown()
+        server.server_close()
+
+
+def test_concurrent_requests_are_all_counted(mock_data):
+    loader = get_data_loader()
+    loader.run_concurrently([partial(loader.get_ensemble_parameters, 1)] * 64)
+    assert loader.connection_stats()["requests"] == 64
+
+
+def test_connection_settings_are_read_from_the_environment(mock_data, monkeypatch):
+    monkeypatch.setenv("WEBVIZ_ERT_POOL_SIZE", "3")
+    monkeypatch.setenv("WEBVIZ_ERT_TIMEOUT", "2.5")
+    monkeypatch.setenv("WEBVIZ_ERT_MAX_CONCURRENCY", "4")
+    loader = get_data_loader()
+    assert loader.timeout == 2.5
+    assert loader.max_concurrency == 4
+    assert loader._adapter._pool_connections == 3
+    assert loader._adapter._pool_maxsize == 4
+
+
+def test_graphql_queries_are_cached(mock_data):
+    loader = get_data_loader()
+    first = loader.get_ensemble(1)
+    loader.get_ensemble("1")
+    assert loader.get_ensemble(1) is first
+    assert webviz_ert.data_loader._requests_post.call_count == 2
+    assert loader.graphql_cache_stats()["hits"] == 1
+    assert loader.graphql_cache_stats()["misses"] == 2
+
+
+def test_graphql_cache_expires_and_evicts():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+
+    cache.put("d", 4, ttl=-1)
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_read_transposed_parquet_matches_pandas():
+    frames = [
+        pd.DataFrame(
+            np.arange(12).reshape(3, 4),
+            columns=["0", "1", "2", "3"],
+            index=["0", "1", "2"],
+        ),
+        pd.DataFrame(np.random.rand(3, 5)),
+        pd.DataFrame(
+            [[1.0, np.nan], [2.0, 3.0]],
+            columns=pd.date_range("2010-01-01", periods=2),
+        ),
+        pd.DataFrame({"a": [1, None], "b": [2, 3]}, dtype="Int64"),
+        pd.DataFrame({"name": ["x", "y"]}),
+        # Payloads without any data column
+        pd.DataFrame(index=["0", "1"]),
+        pd.DataFrame(),
+    ]
+    for frame in frames:
+        content = to_parquet_helper(frame)
+        expected = pd.read_parquet(io.BytesIO(content)).transpose()
+        pd.testing.assert_frame_equal(
+            read_transposed_parquet(content), expected, check_dtype=False
+        )
+
+
+def test_disk_cache_survives_restart(mock_data, tmp_path):
+    loader = get_data_loader()
+    loader.enable_disk_cache(str(tmp_path), max_bytes=1024**2)
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    observations = loader.get_ensemble_record_observations(1, "SNAKE_OIL_GPR_DIFF")
+    assert webviz_ert.data_loader._requests_get.call_count == 2
+
+    DataLoader._instances.clear()
+    loader = get_data_loader()
+    loader.enable_disk_cache(str(tmp_path), max_bytes=1024**2)
+    # Cached by default, also the last ensemble of an experiment
+    assert loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF").equals(data)
+    assert loader.get_ensemble_record_observations(1, "SNAKE_OIL_GPR_DIFF") == (
+        observations
+    )
+    assert webviz_ert.data_loader._requests_get.call_count == 2
+
+    # Served without validators, so a running ensemble is downloaded again
+    loader.set_ensemble_cacheable(1, False)
+    loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert webviz_ert.data_loader._requests_get.call_count == 3
+
+
+def test_disk_cache_revalidates_running_ensembles(mock_data, mocker, tmp_path):
+    url = "http://127.0.0.1:5000/ensembles/1/records/SNAKE_OIL_GPR_DIFF"
+    payloads = {
+        '"v1"': ensembles_response[url],
+        '"v2"': to_parquet_helper(pd.DataFrame([[7, 8]], columns=["0", "1"])),
+    }
+    current = ['"v1"']
+
+    def _requests_get(request_url, headers, **kwargs):
+        if headers.get("If-None-Match") == current[0]:
+            return _MockResponse(request_url, b"", 304)
+        return _MockResponse(
+            request_url, payloads[current[0]], 200, headers={"ETag": current[0]}
+        )
+
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get", side_effect=_requests_get
+    )
+    loader = get_data_loader()
+    loader.enable_disk_cache(str(tmp_path), max_bytes=1024**2)
+    loader.set_ensemble_cacheable(1, False)
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+
+    DataLoader._instances.clear()
+    loader = get_data_loader()
+    loader.enable_disk_cache(str(tmp_path), max_bytes=1024**2)
+    loader.set_ensemble_cacheable(1, False)
+    assert loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF").equals(data)
+    assert requests_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    assert requests_get.call_count == 2
+
+    DataLoader._instances.clear()
+    loader = get_data_loader()
+    loader.enable_disk_cache(str(tmp_path), max_bytes=1024**2)
+    loader.set_ensemble_cacheable(1, False)
+    current[0] = '"v2"'
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert data.index.tolist() == [0, 1]
+    assert loader.revalidation_stats() == {"not_modified": 0, "modified": 1}
+
+
+def test_disk_cache_evicts_least_recently_used(mocker, tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10)
+    scan_sizes = mocker.spy(webviz_ert.data_loader._cache_directory, "scan_sizes")
+    keys = [("record", "url", "1", name, None) for name in "abc"]
+    cache.put(keys[0], b"aaaa")
+    cache.put(keys[1], b"bbbb")
+    # Not rescanned while below the cap
+    assert scan_sizes.call_count == 0
+    past = time.time() - 60
+    os.utime(cache._path(keys[1]), (past, past))
+    cache.put(keys[2], b"cccc")
+    assert scan_sizes.call_count == 1
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == b"aaaa"
+    assert cache.get(keys[2]) == b"cccc"
+    assert cache.size() == 8
+
+
+def test_record_store_serves_memory_mapped_frames(mock_data, tmp_path):
+    loader = get_data_loader()
+    loader.enable_record_store(str(tmp_path), max_bytes=1024**2)
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert data.index.tolist() == list(range(10))
+    assert not data.values.flags.writeable
+    assert loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF").equals(data)
+    assert webviz_ert.data_loader._requests_get.call_count == 1
+
+    store = RecordStore(str(tmp_path), max_bytes=1024**2)
+    frame = pd.DataFrame(
+        np.random.rand(4, 3),
+        index=pd.date_range("2010-01-01", periods=4, name="date"),
+        columns=[0, 1, 2],
+    )
+    assert store.write(("url", "1", "FOPR"), frame)
+    pd.testing.assert_frame_equal(
+        store.read(("url", "1", "FOPR")), frame, check_freq=False
+    )
+    assert not store.write(("url", "1", "NAMES"), pd.DataFrame({"a": ["x"]}))
+    assert store.read(("url", "1", "NAMES")) is None
+
+
+def test_record_store_revalidates_running_ensembles(mock_data, mocker, tmp_path):
+    url = "http://127.0.0.1:5000/ensembles/1/records/SNAKE_OIL_GPR_DIFF"
+
+    def _requests_get(request_url, headers, **kwargs):
+        if headers.get("If-None-Match") == '"v1"':
+            return _MockResponse(request_url, b"", 304)
+        return _MockResponse(
+            request_url, ensembles_response[url], 200, headers={"ETag": '"v1"'}
+        )
+
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get", side_effect=_requests_get
+    )
+    loader = get_data_loader()
+    loader.enable_record_store(str(tmp_path), max_bytes=1024**2)
+    loader.set_ensemble_cacheable(1, False)
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+
+    DataLoader._instances.clear()
+    loader = get_data_loader()
+    loader.enable_record_store(str(tmp_path), max_bytes=1024**2)
+    loader.set_ensemble_cacheable(1, False)
+    revalidated = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert revalidated.equals(data)
+    assert not revalidated.values.flags.writeable
+    assert requests_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+    assert requests_get.call_count == 2
+
+    # Capped to a single record, the least recently read one is evicted
+    store = loader.record_store
+    store.max_bytes = store.size()
+    past = time.time() - 60
+    os.utime(store._path((loader.baseurl, "1", "SNAKE_OIL_GPR_DIFF")), (past, past))
+    assert store.write(("url", "1", "FOPR"), data)
+    assert store.read((loader.baseurl, "1", "SNAKE_OIL_GPR_DIFF")) is None
+    assert store.read(("url", "1", "FOPR")).equals(data)
+
+
+def test_cache_directories_leave_no_files_behind(mocker, tmp_path):
+    store = RecordStore(str(tmp_path / "records"), max_bytes=1024**2)
+    frame = pd.DataFrame(np.random.rand(4, 3))
+    keys = [("url", "1", name) for name in ("FOPR", "FGPR", "NAMES")]
+    with store.lock(keys[0]):
+        assert store.write(keys[0], frame)
+    with store.lock(keys[2]):
+        assert not store.write(keys[2], pd.DataFrame({"a": ["x"]}))
+    assert sorted(os.listdir(store.directory)) == sorted(
+        os.path.basename(store._path(keys[0])) + suffix for suffix in ("", ".lock")
+    )
+
+    # Evicted records take their lock file with them
+    store.max_bytes = store.size()
+    past = time.time() - 60
+    os.utime(store._path(keys[0]), (past, past))
+    assert store.write(keys[1], frame)
+    assert os.listdir(store.directory) == [os.path.basename(store._path(keys[1]))]
+
+    # Failed writes remove their temporary files
+    mocker.patch("pyarrow.feather.write_feather", side_effect=OSError("disk full"))
+    assert not store.write(keys[0], frame)
+    mocker.patch("os.replace", side_effect=OSError("disk full"))
+    cache = DiskCache(str(tmp_path / "payloads"), max_bytes=1024**2)
+    cache.put(("record", "url", "1", "FOPR", None), b"payload", ('"v1"', None))
+    assert os.listdir(cache.directory) == []
+    assert os.listdir(store.directory) == [os.path.basename(store._path(keys[1]))]
+
+
+def test_registry_and_record_store_are_shared_safely(mock_data, mocker, tmp_path):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        loaders = list(
+            executor.map(lambda _: DataLoader("http://127.0.0.1:5000", ""), range(8))
+        )
+    assert all(loader is loaders[0] for loader in loaders)
+
+    # Loaders of two worker processes sharing one record store directory
+    workers = [
+        DataLoader._create("http://127.0.0.1:5000", "", 2, 5, 2) for _ in range(2)
+    ]
+    for worker in workers:
+        worker.enable_record_store(str(tmp_path), max_bytes=1024**2)
+    downloading = threading.Event()
+    release = threading.Event()
+
+    def _slow_requests_get(url, **kwargs):
+        downloading.set()
+        release.wait(timeout=10)
+        return mock_requests_get(url, **kwargs)
+
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get", side_effect=_slow_requests_get
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = [
+            executor.submit(worker.get_ensemble_record_data, 1, "SNAKE_OIL_GPR_DIFF")
+            for worker in workers
+        ]
+        assert downloading.wait(timeout=10)
+        release.set()
+    assert requests_get.call_count == 1
+    assert results[0].result().equals(results[1].result())
+
+    _reset_after_fork()
+    assert not DataLoader._instances
+
+
+def test_metrics_log_is_restarted_after_fork(monkeypatch):
+    monkeypatch.setattr(webviz_ert.data_loader, "_metrics_log_thread", None)
+    monkeypatch.setattr(webviz_ert.data_loader, "_metrics_log_interval", None)
+    start_metrics_log(interval=3600)
+    parent_thread = webviz_ert.data_loader._metrics_log_thread
+
+    _reset_after_fork()
+    child_thread = webviz_ert.data_loader._metrics_log_thread
+    assert child_thread is not None and child_thread is not parent_thread
+    assert child_thread.is_alive()
+    assert webviz_ert.data_loader._metrics_log_interval == 3600
+
+
+def test_records_are_revalidated_with_conditional_requests(mock_data, mocker):
+    url = "http://127.0.0.1:5000/ensembles/1/records/SNAKE_OIL_GPR_DIFF"
+    etag = '"v1"'
+
+    def _requests_get(request_url, headers, **kwargs):
+        if headers.get("If-None-Match") == etag:
+            return _MockResponse(request_url, b"", 304)
+        return _MockResponse(
+            request_url, ensembles_response[url], 200, headers={"ETag": etag}
+        )
+
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get", side_effect=_requests_get
+    )
+    read_parquet = mocker.spy(webviz_ert.data_loader, "read_transposed_parquet")
+    loader = get_data_loader()
+
+    data = loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert "If-None-Match" not in requests_get.call_args[1]["headers"]
+    # Only validators are kept, so without a copy there is nothing to confirm
+    assert loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF").equals(data)
+    assert "If-None-Match" not in requests_get.call_args[1]["headers"]
+
+    cache_key = ("record", loader.baseurl, "1", "SNAKE_OIL_GPR_DIFF", None)
+    stored = (loader._validators(cache_key), data)
+    assert loader._load_record_data(1, "SNAKE_OIL_GPR_DIFF", stored) is data
+    assert requests_get.call_args[1]["headers"]["If-None-Match"] == etag
+    assert requests_get.call_count == 3
+    assert read_parquet.call_count == 2
+    assert loader.revalidation_stats() == {"not_modified": 1, "modified": 0}
+
+
+def test_compute_misfit_decodes_parquet_and_csv(mock_data, mocker):
+    misfits = pd.DataFrame(
+        [[-0.25, 1.5], [4.0, 0.125]], index=[0, 1], columns=["0", "2"]
+    )
+    parquet = io.BytesIO()
+    misfits.to_parquet(parquet)
+    payloads = {
+        "True": parquet.getvalue(),
+        "False": misfits.to_csv().encode(),
+    }
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get",
+        side_effect=lambda url, params, **kwargs: _MockResponse(
+            url, payloads[str(params["summary_misfits"])], 200
+        ),
+    )
+    loader = get_data_loader()
+
+    for summary in (True, False):
+        pd.testing.assert_frame_equal(
+            loader.compute_misfit(1, "FOPR", summary=summary), misfits
+        )
+        assert "application/x-parquet" in (
+            requests_get.call_args[1]["headers"]["accept"]
+        )
+
+
+def test_concurrent_requests_share_one_download(mock_data, mocker):
+    release = threading.Event()
+
+    def _slow_requests_get(url, **kwargs):
+        release.wait(timeout=10)
+        return mock_requests_get(url, **kwargs)
+
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get", side_effect=_slow_requests_get
+    )
+    loader = get_data_loader()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 10
+    while loader.connection_stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert requests_get.call_count == 1
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
+    assert not loader._in_flight
+
+
+def test_failed_requests_are_negatively_cached(mock_data, mocker):
+    status_codes = {"MISSING": 404, "BROKEN": 500}
+    requests_get = mocker.patch(
+        "webviz_ert.data_loader._requests_get",
+        side_effect=lambda url, **kwargs: _MockResponse(
+            url, b"", status_codes[url.rsplit("/", 1)[1]]
+        ),
+    )
+    loader = get_data_loader()
+    loader.missing_ttl = 60
+    loader.failed_ttl = 60
+
+    for _ in range(3):
+        assert loader.get_ensemble_record_data(1, "MISSING").empty
+        assert loader.get_ensemble_record_data(1, "BROKEN").empty
+    assert requests_get.call_count == 2
+
+    suppressed = {record["url"]: record for record in loader.suppressed_records()}
+    assert suppressed["ensembles/1/records/MISSING"]["reason"] == "absent"
+    assert suppressed["ensembles/1/records/MISSING"]["status_code"] == 404
+    assert suppressed["ensembles/1/records/BROKEN"]["reason"] == "failed"
+    assert 0 < suppressed["ensembles/1/records/BROKEN"]["retry_in"] <= 60
+
+    loader.failed_ttl = 0
+    loader.clear_cache()
+    assert loader.suppressed_records() == []
+    loader.get_ensemble_record_data(1, "BROKEN")
+    loader.get_ensemble_record_data(1, "BROKEN")
+    assert requests_get.call_count == 4
+
+
+def test_request_metrics_per_endpoint(mock_data):
+    assert endpoint_class("ensembles/1/records/FOPR") == "records"
+    assert endpoint_class("ensembles/1/records/FOPR/observations") == "observations"
+    assert endpoint_class("ensembles/1/parameters") == "parameters"
+    assert endpoint_class("experiments") == "other"
+
+    loader = get_data_loader()
+    loader.get_ensemble(1)
+    loader.get_ensemble(1)
+    loader.get_ensemble_record_data(1, "SNAKE_OIL_GPR_DIFF")
+    assert loader.get_ensemble_record_data(1, "MISSING").empty
+
+    summary = loader.metrics.summary()
+    assert summary["graphql:ensemble"]["requests"]["count"] == 1
+    assert summary["graphql:ensemble"]["cache"]["graphql"] == {"hit": 1, "miss": 1}
+    assert summary["records"]["requests"]["count"] == 2
+    assert summary["records"]["bytes"] > 0
+    assert summary["records"]["errors"] == 1
+    assert summary["records"]["decoding"]["count"] == 1
+    log_metrics_summary()
+
+    app = dash.Dash(__name__)
+    app.layout = dash.html.Div()
+    _register_metrics(app)
+    _register_metrics(app)
+    response = app.server.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == metrics_exposition()
+    assert (
+        'webviz_ert_request_seconds_count{server="http://127.0.0.1:5000",'
+        'endpoint="records"} 2'
+    ) in metrics_exposition()
+
+    # Samples of every server are grouped under the type of their family
+    other = DataLoader("http://127.0.0.1:5001", None)
+    other.metrics.observe_request("records", 0.1, 10, failed=False)
+    family = None
+    servers = set()
+    for line in metrics_exposition().splitlines():
+        if line.startswith("# TYPE "):
+            family = line.split()[2]
+            continue
+        name = line.split("{")[0]
+        assert name in (family, f"{family}_bucket", f"{family}_sum", f"{family}_count")
+        if name == "webviz_ert_request_seconds_count":
+            servers.add(line.split('"')[1])
+    assert servers == {"http://127.0.0.1:5000", "http://127.0.0.1:5001"}
+
+
+def test_record_projection_reads_only_needed_ranges(mock_data, mocker):
+    # Stored like ERT storage serves responses, one row per realization
+    stored = pd.DataFrame(
+        np.random.rand(100, 1000), columns=[str(step) for step in range(1000)]
+    )
+    buffer = io.BytesIO()
+    stored.to_parquet(buffer)
+    content = buffer.getvalue()
+    sent = []
+    mocker.patch(
+        "webviz_ert.data_loader._requests_get",
+        side_effect=_range_requests_get(content, sent),
+    )
+    loader = get_data_loader()
+    expected = _decode_record_data(content)
+
+    projected = loader.get_ensemble_record_projection(1, "FOPR", x_indexes=[600])
+    pd.testing.assert_frame_equal(projected, expected.iloc[[600]])
+    assert sum(sent) < len(content) / 2
+
+    sent.clear()
+    projected = loader.get_ensemble_record_projection(
+        1, "FOPR", x_indexes=[3, 7], realizations=[2, 5]
+    )
+    pd.testing.assert_frame_equal(projected, expected.iloc[[3, 7], [2, 5]])
+    assert sum(sent) < 16 * 1024
+
+
+def test_record_projection_without_range_support(mock_data):
+    loader = get_data_loader()
+    axis, data = loader.get_ensemble_record_axis(1, "SNAKE_OIL_GPR_DIFF")
+    # The whole record sent in answer to the footer request is returned
+    assert data is not None
+    assert axis.equals(data.index)
+    assert loader.connection_stats()["requests"] == 1
+    assert not loader.supports_projection
+    projected = loader.get_ensemble_record_projection(
+        1, "SNAKE_OIL_GPR_DIFF", x_indexes=[2, 4]
+    )
+    assert projected.equals(data.iloc[[2, 4]])
+
+
+def test_prefetch_runs_by_priority_after_foreground(monkeypatch):
+    monkeypatch.setattr(prefetch, "FOREGROUND_QUIET_SECONDS", 0.0)
+    scheduler = PrefetchScheduler(max_workers=1)
+    ran = []
+    done = threading.Event()
+
+    scheduler.foreground_started()
+    scheduler.submit("records", lambda: ran.append("records"), priority=2)
+    scheduler.submit("listing", lambda: ran.append("listing"), priority=0)
+    scheduler.submit("listing", lambda: ran.append("again"), priority=0)
+    scheduler.submit("observations", done.set, priority=1)
+    scheduler.submit("failing", lambda: 1 / 0, priority=3)
+    time.sleep(0.05)
+    assert ran == []
+
+    scheduler.foreground_finished()
+    assert done.wait(timeout=5)
+    deadline = time.monotonic() + 5
+    while scheduler.stats()["failed"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert ran == ["listing", "records"]
+    assert scheduler.stats() == {
+        "queued": 4,
+        "completed": 3,
+        "failed": 1,
+        "hits": 0,
+        "pending": 0,
+    }
+
+    # Finished tasks can be queued again
+    done.clear()
+    scheduler.submit("observations", done.set, priority=1)
+    assert done.wait(timeout=5)
+    scheduler.close()
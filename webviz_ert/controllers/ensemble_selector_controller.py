@@ -2,8 +2,7 @@ from typing import List, Dict, Any
 from webviz_ert.plugins._webviz_ert import WebvizErtPluginABC
 import dash
 from dash.dependencies import Input, Output, State
-from webviz_ert.data_loader import get_ensembles
-from webviz_ert.models import load_ensemble
+from webviz_ert.models import load_catalogue, load_ensemble, prefetch_ensemble
 
 
 def get_non_selected_options(store: Dict[str, List]) -> List[Dict[str, str]]:
@@ -48,14 +47,8 @@ def ensemble_list_selector_controller(
         if not triggered_id and not ensemble_selection_store:
             ensemble_selection_store = {"options": [], "selected": []}
 
-            if not parent.get_ensembles():
-                ensemble_dict = get_ensembles(project_id=parent.project_identifier)
-                for ensemble_schema in ensemble_dict:
-                    ensemble_id = ensemble_schema["id"]
-                    load_ensemble(parent, ensemble_id)
-
-            for ens_id, ensemble in parent.get_ensembles().items():
-                element = {"label": ensemble.name, "value": ensemble.id}
+            for entry in load_catalogue(parent):
+                element = {"label": entry.name, "value": entry.id}
                 ensemble_selection_store["options"].append(element)
 
         if triggered_id == parent.uuid("ensemble-multi-selector"):
@@ -64,6 +57,7 @@ def ensemble_list_selector_controller(
                 op for op in ens_selector_options if op["value"] == selected_list_elem
             )
             ensemble_selection_store["selected"].append(element)
+            prefetch_ensemble(load_ensemble(parent, selected_list_elem))
 
         if triggered_id == parent.uuid("selected-ensemble-dropdown"):
             element = next(
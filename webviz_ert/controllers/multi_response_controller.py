@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 import webviz_ert.assets as assets
 
 from copy import deepcopy
-from typing import List, Dict, Union, Any, Optional
+from typing import List, Dict, Union, Any, Optional, Tuple
 from dash.dependencies import Input, Output, State, ALL, MATCH
 from dash.exceptions import PreventUpdate
 from webviz_ert.plugins._webviz_ert import WebvizErtPluginABC
@@ -14,8 +14,13 @@ from webviz_ert.models import (
     Response,
     PlotModel,
     load_ensemble,
+    load_response_data,
 )
 
+# Number of x-axis values plotted per realization; zooming in on a longer
+# response fetches finer data for the zoomed range
+MAX_PLOT_POINTS = 2000
+
 
 def _get_realizations_plots(
     realizations_df: pd.DataFrame,
@@ -93,27 +98,43 @@ def _get_observation_plots(observation_df: pd.DataFrame) -> PlotModel:
     return observation_data
 
 
+def _get_x_window(relayout_data: Optional[Dict]) -> Optional[Tuple[Any, Any]]:
+    """
+    The zoomed x-axis range in a graph's relayoutData, (None, None) when
+    the x-axis was reset, or None when the x-axis was left unchanged
+    """
+    if not relayout_data:
+        return None
+    if "xaxis.range[0]" in relayout_data:
+        return relayout_data["xaxis.range[0]"], relayout_data.get("xaxis.range[1]")
+    if "xaxis.range" in relayout_data:
+        return tuple(relayout_data["xaxis.range"])
+    if relayout_data.get("xaxis.autorange"):
+        return None, None
+    return None
+
+
 def _create_response_plot(
     response: Response,
     plot_type: str,
     selected_realizations: List[int],
     color: str,
     style: Optional[Dict] = None,
+    x_window: Tuple[Any, Any] = (None, None),
 ) -> ResponsePlotModel:
 
-    x_axis = response.axis
+    data_df = response.data_window(*x_window, max_points=MAX_PLOT_POINTS)
+    if selected_realizations:
+        data_df = data_df.iloc[:, selected_realizations]
+    x_axis = data_df.index
     if plot_type == "Statistics":
-        realizations = _get_realizations_statistics_plots(
-            response.data_df(selected_realizations), x_axis, color=color
-        )
+        realizations = _get_realizations_statistics_plots(data_df, x_axis, color=color)
     else:
         realizations = _get_realizations_plots(
-            response.data_df(selected_realizations), x_axis, color=color, style=style
+            data_df, x_axis, color=color, style=style
         )
     if response.observations:
-        observations = [
-            _get_observation_plots(obs.data_df()) for obs in response.observations
-        ]
+        observations = [_get_observation_plots(response.observation_table.data_df())]
     else:
         observations = []
 
@@ -141,6 +162,14 @@ def multi_response_controller(parent: WebvizErtPluginABC, app: dash.Dash) -> Non
         [
             Input({"index": MATCH, "type": parent.uuid("plot-type")}, "value"),
             Input(parent.uuid("ensemble-selection-store"), "modified_timestamp"),
+            Input(
+                {
+                    "index": MATCH,
+                    "id": parent.uuid("response-graphic"),
+                    "type": parent.uuid("graph"),
+                },
+                "relayoutData",
+            ),
         ],
         [
             State(parent.uuid("selected-ensemble-dropdown"), "value"),
@@ -150,18 +179,36 @@ def multi_response_controller(parent: WebvizErtPluginABC, app: dash.Dash) -> Non
     def update_graph(
         plot_type: str,
         _: Any,
+        relayout_data: Optional[Dict],
         selected_ensembles: List[str],
         response: Optional[str],
     ) -> go.Figure:
         if not response or not selected_ensembles:
             raise PreventUpdate
 
+        x_window = _get_x_window(relayout_data)
+        ctx = dash.callback_context
+        relayouted = any(
+            "relayoutData" in trigger["prop_id"] for trigger in ctx.triggered
+        )
+        if relayouted and x_window is None:
+            # Only y-axis zoom, resizing or similar, the data is unchanged
+            raise PreventUpdate
+        if x_window is None:
+            x_window = (None, None)
+
+        load_response_data(
+            [load_ensemble(parent, ensemble_id) for ensemble_id in selected_ensembles],
+            [response],
+            window=(*x_window, MAX_PLOT_POINTS),
+        )
+
         def _generate_plot(ensemble_id: str, color: str) -> Optional[ResponsePlotModel]:
             ensemble = load_ensemble(parent, ensemble_id)
             if response not in ensemble.responses:
                 return None
             plot = _create_response_plot(
-                ensemble.responses[response], plot_type, [], color
+                ensemble.responses[response], plot_type, [], color, x_window=x_window
             )
             return plot
 
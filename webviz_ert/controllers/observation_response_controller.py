@@ -14,6 +14,7 @@ from webviz_ert.models import (
     Response,
     MultiHistogramPlotModel,
     load_ensemble,
+    load_response_data,
 )
 from webviz_ert import assets
 
@@ -105,6 +106,11 @@ def observation_response_controller(parent: WebvizErtPluginABC, app: dash.Dash)
         if not response or response == "" or not selected_ensembles:
             raise PreventUpdate
 
+        load_response_data(
+            [load_ensemble(parent, ensemble_id) for ensemble_id in selected_ensembles],
+            [response],
+        )
+
         if misfits_type == "Summary":
             data_dict = {}
             colors = {}
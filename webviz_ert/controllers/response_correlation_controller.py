@@ -13,6 +13,7 @@ from plotly.subplots import make_subplots
 from webviz_ert.plugins._webviz_ert import WebvizErtPluginABC
 from webviz_ert.models import (
     load_ensemble,
+    load_response_data,
     BarChartPlotModel,
     PlotModel,
 )
@@ -72,6 +73,12 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
         colors = {}
         heatmaps = []
 
+        x_indexes = {response: corr_xindex.get(response, 0) for response in responses}
+        load_response_data(
+            [load_ensemble(parent, ensemble_id) for ensemble_id in ensembles],
+            responses,
+            x_indexes=x_indexes,
+        )
         df_index = None
         for index, ensemble_id in enumerate(ensembles):
             ensemble = load_ensemble(parent, ensemble_id)
@@ -79,9 +86,8 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
             if parameter_df.empty:
                 continue
             for response in responses:
-                response_df = ensemble.responses[response].data_df()
-                x_index = corr_xindex.get(response, 0)
-                parameter_df[response] = response_df.iloc[x_index]
+                response_model = ensemble.responses[response]
+                parameter_df[response] = response_model.data_at(x_indexes[response])
 
             corrdf = parameter_df.corr(method=correlation_metric)
             corrdf = corrdf.drop(responses, axis=0).fillna(0)
@@ -164,6 +170,10 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
         _plots = []
         _obs_plots: List[PlotModel] = []
 
+        load_response_data(
+            [load_ensemble(parent, ensemble_id) for ensemble_id in ensembles],
+            [selected_response],
+        )
         for index, ensemble_id in enumerate(ensembles):
             ensemble = load_ensemble(parent, ensemble_id)
             response = ensemble.responses[selected_response]
@@ -191,8 +201,9 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
             ]
 
             if response.observations:
-                for obs in response.observations:
-                    _obs_plots.append(_get_observation_plots(obs.data_df()))
+                _obs_plots.append(
+                    _get_observation_plots(response.observation_table.data_df())
+                )
 
         fig = go.Figure()
         for plot in _plots:
@@ -272,9 +283,8 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
                 y_data = ensemble.parameters[selected_parameter].data_df()
                 response = ensemble.responses[selected_response]
 
-                if isinstance(response.axis, pd.Index) and not response.axis.empty:
-                    x_index = corr_xindex.get(selected_response, 0)
-                    x_data = response.data_df().iloc[x_index]
+                x_data = response.data_at(corr_xindex.get(selected_response, 0))
+                if not x_data.empty:
                     style = deepcopy(assets.ERTSTYLE["response-plot"]["response-index"])
                     ensemble_color = assets.get_color(index=index)
                     style["marker"]["color"] = ensemble_color
@@ -284,7 +294,7 @@ def response_correlation_controller(parent: WebvizErtPluginABC, app: dash.Dash)
                             x_axis=x_data.values.flatten(),
                             y_axis=y_data.values.flatten(),
                             text="Mean",
-                            name=f"{repr(ensemble)}: {selected_response}x{selected_parameter}@{response.axis[x_index]}",
+                            name=f"{repr(ensemble)}: {selected_response}x{selected_parameter}@{x_data.name}",
                             **style,
                         )
                     ]
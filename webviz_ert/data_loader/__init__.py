@@ -1,35 +1,83 @@
+import hashlib
 import json
-from typing import Any, Mapping, Optional, List, MutableMapping, Tuple, Dict
-from collections import defaultdict
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Mapping,
+    Optional,
+    List,
+    MutableMapping,
+    Sequence,
+    Tuple,
+    Dict,
+    TypeVar,
+    Union,
+)
 from pprint import pformat
 import requests
+import requests.adapters
 import logging
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import io
 
+from webviz_ert.data_loader._cache import LRUCache
+from webviz_ert.data_loader._arrow import column_labels, read_transposed_parquet
+from webviz_ert.data_loader._disk_cache import DiskCache, DiskCacheKey, Validators
+from webviz_ert.data_loader._record_store import RecordStore
+from webviz_ert.data_loader._range_file import RangeFile
+from webviz_ert.data_loader._metrics import METRIC_FAMILIES, Metrics, endpoint_class
+from webviz_ert.data_loader._memory import MemoryBudget, frame_bytes
+from webviz_ert.data_loader._prefetch import (
+    PrefetchScheduler,
+    PRIORITY_LISTING,
+    PRIORITY_OBSERVATIONS,
+    PRIORITY_RECORDS,
+)
+
 logger = logging.getLogger()
 
 connection_info_map: dict = {}
 
 
+_connection_info_lock = threading.Lock()
+
+
 def get_connection_info(project_id: str = None) -> Mapping[str, str]:
     from ert_shared.storage.connection import get_info
 
-    if project_id not in connection_info_map:
-        info = get_info(project_id)
-        info["auth"] = info["auth"][1]
-        connection_info_map[project_id] = info
+    with _connection_info_lock:
+        if project_id not in connection_info_map:
+            info = get_info(project_id)
+            info["auth"] = info["auth"][1]
+            connection_info_map[project_id] = info
 
-    return connection_info_map[project_id]
+        return connection_info_map[project_id]
 
 
 # these are needed to mock for testing
-def _requests_get(*args: Any, **kwargs: Any) -> requests.models.Response:
-    return requests.get(*args, **kwargs)
+def _requests_get(
+    *args: Any, session: Optional[requests.Session] = None, **kwargs: Any
+) -> requests.models.Response:
+    if session is None:
+        return requests.get(*args, **kwargs)
+    return session.get(*args, **kwargs)
 
 
-def _requests_post(*args: Any, **kwargs: Any) -> requests.models.Response:
-    return requests.post(*args, **kwargs)
+def _requests_post(
+    *args: Any, session: Optional[requests.Session] = None, **kwargs: Any
+) -> requests.models.Response:
+    if session is None:
+        return requests.post(*args, **kwargs)
+    return session.post(*args, **kwargs)
 
 
 GET_REALIZATION = """\
@@ -92,6 +140,32 @@ query ($id: ID!) {
 }
 """
 
+GET_ENSEMBLE_CATALOGUE = """\
+query {
+  experiments {
+    id
+    name
+    ensembles {
+      id
+      size
+      activeRealizations
+      timeCreated
+      userdata
+      children {
+        ensembleResult{
+          id
+        }
+      }
+      parent {
+        ensembleReference{
+          id
+        }
+      }
+    }
+  }
+}
+"""
+
 GET_PRIORS = """\
 query($id: ID!) {
   experiment(id: $id) {
@@ -100,47 +174,437 @@ query($id: ID!) {
 }
 """
 
+# Names of the GraphQL queries in the metrics, see `Metrics`
+GRAPHQL_QUERY_NAMES = {
+    GET_ALL_ENSEMBLES: "all_ensembles",
+    GET_ENSEMBLE: "ensemble",
+    GET_ENSEMBLE_CATALOGUE: "ensemble_catalogue",
+    GET_PRIORS: "priors",
+}
+
+# Maximum number of GraphQL results kept by each DataLoader
+GRAPHQL_CACHE_SIZE = 512
+# Seconds a GraphQL result is reused before the server is asked again.
+# The ensemble listing changes whenever ERT starts a new iteration, while
+# ensemble metadata and experiment priors never change once written.
+GRAPHQL_CACHE_TTL = {
+    GET_ALL_ENSEMBLES: 10.0,
+    GET_ENSEMBLE_CATALOGUE: 10.0,
+    GET_ENSEMBLE: 3600.0,
+    GET_PRIORS: 3600.0,
+}
+DEFAULT_GRAPHQL_CACHE_TTL = 60.0
 
 data_cache: dict = {}
 ServerIdentifier = Tuple[str, Optional[str]]  # (baseurl, optional token)
 
+# Number of keep-alive connections kept open to a storage server
+POOL_SIZE_ENV = "WEBVIZ_ERT_POOL_SIZE"
+DEFAULT_POOL_SIZE = 10
+# Seconds to wait for the storage server to connect and to send data
+TIMEOUT_ENV = "WEBVIZ_ERT_TIMEOUT"
+DEFAULT_TIMEOUT = 60.0
+# Maximum number of requests a DataLoader has in flight at the same time
+MAX_CONCURRENCY_ENV = "WEBVIZ_ERT_MAX_CONCURRENCY"
+DEFAULT_MAX_CONCURRENCY = 8
+# Number of threads prefetching data in the background, kept below
+# DEFAULT_MAX_CONCURRENCY so foreground requests always find a free slot
+DEFAULT_PREFETCH_WORKERS = 2
+# Number of payloads whose validators are kept, see `DataLoader._validators`
+REVALIDATION_CACHE_SIZE = 256
+# Records are cached on disk when this environment variable names a directory
+DISK_CACHE_DIR_ENV = "WEBVIZ_ERT_CACHE_DIR"
+# Size cap of the on-disk record cache in megabytes
+DISK_CACHE_SIZE_ENV = "WEBVIZ_ERT_CACHE_SIZE_MB"
+DEFAULT_DISK_CACHE_SIZE_MB = 2048
+# Response records are served memory-mapped from Arrow IPC files written to
+# the directory named by this environment variable
+RECORD_STORE_DIR_ENV = "WEBVIZ_ERT_RECORD_STORE_DIR"
+# Size cap of the record store in megabytes
+RECORD_STORE_SIZE_ENV = "WEBVIZ_ERT_RECORD_STORE_SIZE_MB"
+DEFAULT_RECORD_STORE_SIZE_MB = 2048
+# Seconds a request answered with 404/410 is not repeated
+MISSING_RECORD_TTL_ENV = "WEBVIZ_ERT_MISSING_RECORD_TTL"
+DEFAULT_MISSING_RECORD_TTL = 60.0
+# Seconds a request that failed otherwise (server error, connection
+# error, timeout) is not repeated
+FAILED_REQUEST_TTL_ENV = "WEBVIZ_ERT_FAILED_REQUEST_TTL"
+DEFAULT_FAILED_REQUEST_TTL = 5.0
+# Number of failed requests remembered by the negative cache
+NEGATIVE_CACHE_SIZE = 1024
+# Status codes telling that a record does not exist, as opposed to a
+# transient failure
+ABSENT_STATUS_CODES = (404, 410)
+
+# Leading bytes of every parquet file
+PARQUET_MAGIC = b"PAR1"
+# Bytes requested from the end of a parquet payload to read its footer
+PARQUET_TAIL_BYTES = 64 * 1024
+# Number of parquet footers kept to project records without reading them
+# again, see `get_ensemble_record_projection`
+PARQUET_METADATA_CACHE_SIZE = 32
+
+# Megabytes of response and parameter data kept by the models of one
+# server before the least recently used data is evicted, 0 for no limit
+MEMORY_BUDGET_ENV = "WEBVIZ_ERT_MEMORY_BUDGET_MB"
+DEFAULT_MEMORY_BUDGET_MB = 2048
+
+# Seconds between structured log summaries of the request metrics,
+# 0 disables them
+METRICS_LOG_INTERVAL_ENV = "WEBVIZ_ERT_METRICS_LOG_INTERVAL"
+DEFAULT_METRICS_LOG_INTERVAL = 300.0
+
+T = TypeVar("T")
+
+
+def _graphql_endpoint(query: str) -> str:
+    return f"graphql:{GRAPHQL_QUERY_NAMES.get(query, 'other')}"
+
 
 class DataLoaderException(Exception):
-    pass
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def is_absent(self) -> bool:
+        """The server reported the requested resource as not existing"""
+        return self.status_code in ABSENT_STATUS_CODES
+
+
+def _record_index(labels: pd.Index) -> pd.Index:
+    try:
+        return labels.astype(int)
+    except (TypeError, ValueError):
+        # Summary vectors are indexed by dates
+        return labels
+
+
+def _decode_record_data(content: bytes) -> pd.DataFrame:
+    df = read_transposed_parquet(content)
+    df.index = _record_index(df.index)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    return df
+
+
+def _project_record_data(
+    parquet: pq.ParquetFile,
+    x_indexes: Optional[Sequence[int]],
+    realizations: Optional[Sequence[int]],
+) -> pd.DataFrame:
+    """
+    Decodes the rows at the given x-axis positions and the columns of the
+    given realization positions of the frame `_decode_record_data` returns
+    """
+    labels = _record_index(column_labels(parquet))
+    if labels.is_monotonic_increasing:
+        order = np.arange(len(labels))
+    else:
+        order = np.argsort(labels.values, kind="stable")
+    columns = order if x_indexes is None else order[list(x_indexes)]
+    df = read_transposed_parquet(parquet, columns=columns.tolist(), rows=realizations)
+    df.index = labels[columns]
+    return df
+
+
+def _content_range_size(resp: requests.Response) -> int:
+    """Total payload size from a `Content-Range: bytes a-b/size` header"""
+    try:
+        return int(resp.headers["Content-Range"].rsplit("/", 1)[1])
+    except (KeyError, IndexError, ValueError):
+        raise DataLoaderException(
+            f"Invalid Content-Range in partial response: {resp.headers}"
+        )
+
+
+def _decode_misfits(content: bytes) -> pd.DataFrame:
+    # Servers without parquet support for misfits answer with CSV
+    if content[:4] == PARQUET_MAGIC:
+        return pd.read_parquet(io.BytesIO(content))
+    stream = io.BytesIO(content)
+    return pd.read_csv(stream, index_col=0, float_precision="round_trip")
 
 
 class DataLoader:
     _instances: MutableMapping[ServerIdentifier, "DataLoader"] = {}
+    _instances_lock = threading.Lock()
 
     baseurl: str
     token: Optional[str]
-    _graphql_cache: MutableMapping[str, MutableMapping[dict, Any]]
+    timeout: Optional[float]
+    max_concurrency: int
+    _request_slots: threading.BoundedSemaphore
+    _session: requests.Session
+    _adapter: requests.adapters.HTTPAdapter
+    _request_count: int
+    _request_count_lock: threading.Lock
+    _in_flight: Dict[Hashable, Future]
+    _in_flight_lock: threading.Lock
+    _coalesced_count: int
+    _graphql_cache: LRUCache
+    _revalidation_cache: LRUCache
+    _revalidation_stats: Dict[str, int]
+    _negative_cache: LRUCache
+    _parquet_metadata_cache: LRUCache
+    _range_requests: Optional[bool]
+    prefetcher: PrefetchScheduler
+    metrics: Metrics
+    memory: MemoryBudget
+    missing_ttl: float
+    failed_ttl: float
+    disk_cache: Optional[DiskCache]
+    record_store: Optional[RecordStore]
 
-    def __new__(cls, baseurl: str, token: Optional[str] = None) -> "DataLoader":
-        if (baseurl, token) in cls._instances:
+    def __new__(
+        cls,
+        baseurl: str,
+        token: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> "DataLoader":
+        with cls._instances_lock:
+            if (baseurl, token) not in cls._instances:
+                cls._instances[(baseurl, token)] = cls._create(
+                    baseurl, token, pool_size, timeout, max_concurrency
+                )
             return cls._instances[(baseurl, token)]
 
+    @classmethod
+    def _create(
+        cls,
+        baseurl: str,
+        token: Optional[str],
+        pool_size: int,
+        timeout: Optional[float],
+        max_concurrency: int,
+    ) -> "DataLoader":
         loader = super().__new__(cls)
         loader.baseurl = baseurl
         loader.token = token
-        loader._graphql_cache = defaultdict(dict)
-        cls._instances[(baseurl, token)] = loader
+        loader.timeout = timeout
+        loader.max_concurrency = max_concurrency
+        loader._request_slots = threading.BoundedSemaphore(max_concurrency)
+        loader._adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=max(pool_size, max_concurrency)
+        )
+        loader._session = requests.Session()
+        loader._session.mount("http://", loader._adapter)
+        loader._session.mount("https://", loader._adapter)
+        loader._request_count = 0
+        loader._request_count_lock = threading.Lock()
+        loader._in_flight = {}
+        loader._in_flight_lock = threading.Lock()
+        loader._coalesced_count = 0
+        loader._graphql_cache = LRUCache(max_entries=GRAPHQL_CACHE_SIZE)
+        loader._revalidation_cache = LRUCache(max_entries=REVALIDATION_CACHE_SIZE)
+        loader._revalidation_stats = {"not_modified": 0, "modified": 0}
+        loader._negative_cache = LRUCache(max_entries=NEGATIVE_CACHE_SIZE)
+        loader._parquet_metadata_cache = LRUCache(
+            max_entries=PARQUET_METADATA_CACHE_SIZE
+        )
+        loader._range_requests = None
+        loader.metrics = Metrics()
+        loader.memory = MemoryBudget(
+            int(os.getenv(MEMORY_BUDGET_ENV, DEFAULT_MEMORY_BUDGET_MB)) * 1024**2
+        )
+        loader.prefetcher = PrefetchScheduler(
+            max_workers=min(DEFAULT_PREFETCH_WORKERS, max(max_concurrency - 1, 1))
+        )
+        loader.missing_ttl = float(
+            os.getenv(MISSING_RECORD_TTL_ENV, DEFAULT_MISSING_RECORD_TTL)
+        )
+        loader.failed_ttl = float(
+            os.getenv(FAILED_REQUEST_TTL_ENV, DEFAULT_FAILED_REQUEST_TTL)
+        )
+        loader.disk_cache = None
+        if os.getenv(DISK_CACHE_DIR_ENV):
+            loader.enable_disk_cache(
+                os.path.join(
+                    os.environ[DISK_CACHE_DIR_ENV],
+                    hashlib.sha256(baseurl.encode()).hexdigest()[:16],
+                ),
+                max_bytes=int(
+                    os.getenv(DISK_CACHE_SIZE_ENV, DEFAULT_DISK_CACHE_SIZE_MB)
+                )
+                * 1024**2,
+            )
+        loader.record_store = None
+        if os.getenv(RECORD_STORE_DIR_ENV):
+            loader.enable_record_store(
+                os.path.join(
+                    os.environ[RECORD_STORE_DIR_ENV],
+                    hashlib.sha256(baseurl.encode()).hexdigest()[:16],
+                ),
+                max_bytes=int(
+                    os.getenv(RECORD_STORE_SIZE_ENV, DEFAULT_RECORD_STORE_SIZE_MB)
+                )
+                * 1024**2,
+            )
         return loader
 
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Number of requests sent through the pooled session, number of TCP
+        connections opened to serve them and how many requests were served
+        by an already open (keep-alive) connection
+        """
+        pools = self._adapter.poolmanager.pools
+        connections = sum(pools[key].num_connections for key in pools.keys())
+        with self._request_count_lock:
+            requests_sent = self._request_count
+        return {
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": max(requests_sent - connections, 0),
+            "coalesced": self._coalesced_count,
+        }
+
+    def _count_request(self) -> None:
+        # Requests are sent from several threads at once
+        with self._request_count_lock:
+            self._request_count += 1
+
+    def _single_flight(self, key: Hashable, load: Callable[[], T]) -> T:
+        """
+        Runs `load` once for concurrent callers asking for the same key: the
+        first caller loads, the others wait for and share its result (or
+        exception)
+        """
+        with self._in_flight_lock:
+            leader = key not in self._in_flight
+            if leader:
+                self._in_flight[key] = Future()
+            else:
+                self._coalesced_count += 1
+            future = self._in_flight[key]
+        if not leader:
+            return future.result()
+
+        try:
+            result = load()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def run_concurrently(self, tasks: Sequence[Callable[[], T]]) -> List[T]:
+        """
+        Runs the given fetch functions on a thread pool and returns their
+        results in order. At most `max_concurrency` requests are sent to
+        the server at once, however many tasks or callers there are.
+        """
+        if len(tasks) <= 1:
+            return [task() for task in tasks]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(tasks))
+        ) as executor:
+            futures = [executor.submit(task) for task in tasks]
+            return [future.result() for future in futures]
+
+    def enable_disk_cache(self, directory: str, max_bytes: int) -> None:
+        self.disk_cache = DiskCache(directory, max_bytes)
+
+    def enable_record_store(self, directory: str, max_bytes: int) -> None:
+        self.record_store = RecordStore(directory, max_bytes)
+
+    def set_ensemble_cacheable(self, ensemble_id: str, cacheable: bool) -> None:
+        """
+        Disk cache and record store entries are served as they are, unless
+        the ensemble is still running and made not `cacheable`. Its records
+        may then change, and are revalidated with the server before use.
+        """
+        for cache in (self.disk_cache, self.record_store):
+            if cache is not None:
+                cache.set_finished(str(ensemble_id), cacheable)
+
+    def graphql_cache_stats(self) -> Dict[str, int]:
+        return self._graphql_cache.stats()
+
+    def revalidation_stats(self) -> Dict[str, int]:
+        """
+        How often a conditional request found the payload unchanged (304)
+        or had to download it again
+        """
+        return dict(self._revalidation_stats)
+
+    def suppressed_records(self) -> List[Dict[str, Any]]:
+        """
+        Requests currently answered from the negative cache instead of being
+        sent, with the reason ("absent" or "failed"), the status code of the
+        original failure and the seconds left until they are retried
+        """
+        return [
+            {
+                "url": key[0],
+                "params": json.loads(key[1]),
+                "reason": "absent" if error.is_absent else "failed",
+                "status_code": error.status_code,
+                "retry_in": retry_in,
+            }
+            for key, error, retry_in in self._negative_cache.items()
+        ]
+
+    def clear_cache(self) -> None:
+        self._graphql_cache.clear()
+        self._revalidation_cache.clear()
+        self._negative_cache.clear()
+        self._parquet_metadata_cache.clear()
+
+    def close(self) -> None:
+        self.prefetcher.close()
+        self._session.close()
+
     def _query(self, query: str, **kwargs: Any) -> dict:
         """
         Cachable GraphQL helper
         """
-        # query_cache = self._graphql_cache[query].get(kwargs)
-        # if query_cache is not None:
-        #     return query_cache
-        resp = _requests_post(
-            f"{self.baseurl}/gql",
-            json={
-                "query": query,
-                "variables": kwargs,
-            },
-            headers={"Token": self.token},
+        key = (query, json.dumps(kwargs, sort_keys=True, default=str))
+        query_cache = self._graphql_cache.get(key)
+        self.metrics.observe_cache(
+            _graphql_endpoint(query), "graphql", hit=query_cache is not None
+        )
+        if query_cache is not None:
+            return query_cache
+        return self._single_flight(
+            ("gql",) + key, partial(self._post_query, key, query, kwargs)
+        )
+
+    def _post_query(self, key: Tuple[str, str], query: str, variables: dict) -> dict:
+        endpoint = _graphql_endpoint(query)
+        self.prefetcher.foreground_started()
+        try:
+            with self._request_slots:
+                self._count_request()
+                start = time.perf_counter()
+                resp = _requests_post(
+                    f"{self.baseurl}/gql",
+                    session=self._session,
+                    json={
+                        "query": query,
+                        "variables": variables,
+                    },
+                    headers={"Token": self.token},
+                    timeout=self.timeout,
+                )
+        except requests.RequestException:
+            self.metrics.observe_request(
+                endpoint, time.perf_counter() - start, 0, failed=True
+            )
+            raise
+        finally:
+            self.prefetcher.foreground_finished()
+        self.metrics.observe_request(
+            endpoint,
+            time.perf_counter() - start,
+            len(resp.content),
+            failed=resp.status_code != 200,
         )
         try:
             doc = resp.json()
@@ -150,28 +614,195 @@ class DataLoader:
             raise RuntimeError(
                 f"ERT Storage query returned with '{resp.status_code}':\n{pformat(doc)}"
             )
+        self._graphql_cache.put(
+            key,
+            doc["data"],
+            ttl=GRAPHQL_CACHE_TTL.get(query, DEFAULT_GRAPHQL_CACHE_TTL),
+        )
         return doc["data"]
 
     def _get(
-        self, url: str, headers: dict = None, params: dict = None
+        self, url: str, headers: Optional[dict] = None, params: Optional[dict] = None
     ) -> requests.Response:
         if headers is None:
             headers = {}
 
-        resp = _requests_get(
-            f"{self.baseurl}/{url}",
-            headers={**headers, "Token": self.token},
-            params=params,
-        )
-        if resp.status_code != 200:
+        # Failed requests are not repeated until their negative cache entry
+        # expires, missing records for longer than transient failures
+        negative_key = (url, json.dumps(params, sort_keys=True, default=str))
+        error = self._negative_cache.get(negative_key)
+        endpoint = endpoint_class(url)
+        self.metrics.observe_cache(endpoint, "negative", hit=error is not None)
+        if error is not None:
             raise DataLoaderException(
+                f"Skipped request to {self.baseurl}/{url}, it recently failed "
+                f"with: {error}",
+                status_code=error.status_code,
+            )
+
+        self.prefetcher.foreground_started()
+        try:
+            with self._request_slots:
+                self._count_request()
+                start = time.perf_counter()
+                resp = _requests_get(
+                    f"{self.baseurl}/{url}",
+                    session=self._session,
+                    headers={**headers, "Token": self.token},
+                    params=params,
+                    timeout=self.timeout,
+                )
+        except requests.RequestException as e:
+            self.metrics.observe_request(
+                endpoint, time.perf_counter() - start, 0, failed=True
+            )
+            error = DataLoaderException(
+                f"Error fetching data from {self.baseurl}/{url}: {e}"
+            )
+            if "Range" not in headers:
+                self._negative_cache.put(negative_key, error, ttl=self.failed_ttl)
+            raise error from e
+        finally:
+            self.prefetcher.foreground_finished()
+        self.metrics.observe_request(
+            endpoint,
+            time.perf_counter() - start,
+            len(resp.content),
+            failed=resp.status_code not in (200, 206, 304),
+        )
+        # 304 Not Modified answers a conditional request, see `_fetch`, and
+        # 206 Partial Content a range request
+        if resp.status_code not in (200, 206, 304):
+            error = DataLoaderException(
                 f"""Error fetching data from {self.baseurl}/{url}
                 The request return with status code: {resp.status_code}
                 {str(resp.content)}
-                """
+                """,
+                status_code=resp.status_code,
             )
+            # A server may refuse a range but serve the whole payload
+            if "Range" not in headers:
+                self._negative_cache.put(
+                    negative_key,
+                    error,
+                    ttl=self.missing_ttl if error.is_absent else self.failed_ttl,
+                )
+            raise error
         return resp
 
+    def _fetch(
+        self,
+        url: str,
+        cache_key: DiskCacheKey,
+        decode: Callable[[bytes], T],
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        stored: Optional[Tuple[Validators, T]] = None,
+        sent: Optional[requests.Response] = None,
+    ) -> T:
+        """
+        Fetches and decodes a payload once for concurrent callers, revalidating
+        a `stored` copy or one on disk, unless the payload was `sent` already
+        """
+        key = (
+            url,
+            json.dumps(params, sort_keys=True, default=str),
+            (headers or {}).get("accept"),
+        )
+        return self._single_flight(
+            key,
+            partial(
+                self._download, url, cache_key, decode, headers, params, stored, sent
+            ),
+        )
+
+    def _download(
+        self,
+        url: str,
+        cache_key: DiskCacheKey,
+        decode: Callable[[bytes], T],
+        headers: Optional[dict],
+        params: Optional[dict],
+        stored: Optional[Tuple[Validators, T]],
+        sent: Optional[requests.Response],
+    ) -> T:
+        endpoint = endpoint_class(url)
+        if sent is not None:
+            return self._keep(endpoint, cache_key, decode, sent)
+        # The copy the server is asked to confirm: the caller's own, served
+        # as it is, or the one on disk, decoded once confirmed
+        validated: Optional[Validators] = None
+        confirmed: Optional[T] = None
+        content: Optional[bytes] = None
+        if stored is not None and any(stored[0]):
+            validated, confirmed = stored
+        if self.disk_cache is not None:
+            content = self.disk_cache.get(cache_key)
+            self.metrics.observe_cache(endpoint, "disk", hit=content is not None)
+            if content is not None and self.disk_cache.is_finished(cache_key):
+                return self._decode(endpoint, decode, content)
+            # Payloads of other ensembles may have changed since they were
+            # stored, e.g. by an earlier run of webviz-ert, and are only
+            # served once the server confirms them
+            validators = self.disk_cache.validators(cache_key)
+            if validated is None and content is not None and any(validators):
+                validated = validators
+
+        conditional_headers = dict(headers or {})
+        if validated is not None:
+            etag, last_modified = validated
+            if etag:
+                conditional_headers["If-None-Match"] = etag
+            if last_modified:
+                conditional_headers["If-Modified-Since"] = last_modified
+
+        resp = self._get(url=url, headers=conditional_headers, params=params)
+        if validated is not None:
+            self.metrics.observe_cache(
+                endpoint, "revalidation", hit=resp.status_code == 304
+            )
+        if resp.status_code == 304:
+            if validated is not None:
+                self._revalidation_stats["not_modified"] += 1
+                if confirmed is not None:
+                    return confirmed
+                if content is not None:
+                    return self._decode(endpoint, decode, content)
+            resp = self._get(url=url, headers=headers, params=params)
+        elif validated is not None:
+            self._revalidation_stats["modified"] += 1
+        return self._keep(endpoint, cache_key, decode, resp)
+
+    def _keep(
+        self,
+        endpoint: str,
+        cache_key: DiskCacheKey,
+        decode: Callable[[bytes], T],
+        resp: requests.Response,
+    ) -> T:
+        """Decodes a downloaded payload, keeping it for revalidation"""
+        value = self._decode(endpoint, decode, resp.content)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.disk_cache is not None:
+            self.disk_cache.put(cache_key, resp.content, (etag, last_modified))
+        if etag or last_modified:
+            self._revalidation_cache.put(cache_key, (etag, last_modified))
+        return value
+
+    def _validators(self, cache_key: DiskCacheKey) -> Validators:
+        """Validators of the last response to the request of `cache_key`"""
+        validators = self._revalidation_cache.get(cache_key)
+        if validators is None:
+            return None, None
+        return validators
+
+    def _decode(self, endpoint: str, decode: Callable[[bytes], T], content: bytes) -> T:
+        start = time.perf_counter()
+        value = decode(content)
+        self.metrics.observe_decode(endpoint, time.perf_counter() - start)
+        return value
+
     def get_all_ensembles(self) -> list:
         try:
             experiments = self._query(GET_ALL_ENSEMBLES)["experiments"]
@@ -184,6 +815,22 @@ class DataLoader:
             logger.error(e)
             return list()
 
+    def get_ensemble_catalogue(self) -> List[dict]:
+        """
+        Fetches the schema of every ensemble in one request, in the same
+        shape as returned by `get_ensemble`
+        """
+        try:
+            experiments = self._query(GET_ENSEMBLE_CATALOGUE)["experiments"]
+            return [
+                {**ens, "experiment": {"id": exp["id"], "name": exp["name"]}}
+                for exp in experiments
+                for ens in exp["ensembles"]
+            ]
+        except RuntimeError as e:
+            logger.error(e)
+            return list()
+
     def get_ensemble(self, ensemble_id: str) -> dict:
         try:
             return self._query(GET_ENSEMBLE, id=ensemble_id)["ensemble"]
@@ -221,12 +868,15 @@ class DataLoader:
             logger.error(e)
             return list()
 
-    def get_experiment_priors(self, experiment_id: str) -> dict:
+    def get_experiment_priors(self, experiment_id: str, strict: bool = False) -> dict:
+        """With `strict`, failures are raised instead of logged"""
         try:
             return json.loads(
                 self._query(GET_PRIORS, id=experiment_id)["experiment"]["priors"]
             )
         except RuntimeError as e:
+            if strict:
+                raise
             logger.error(e)
             return dict()
 
@@ -236,21 +886,42 @@ class DataLoader:
         parameter_name: str,
     ) -> pd.DataFrame:
         try:
+            label: Optional[str]
             if "::" in parameter_name:
                 name, label = parameter_name.split("::", 1)
                 params = {"label": label}
             else:
-                name = parameter_name
+                name, label = parameter_name, None
                 params = {}
 
-            resp = self._get(
+            return self._fetch(
                 url=f"ensembles/{ensemble_id}/records/{name}",
+                cache_key=("record", self.baseurl, str(ensemble_id), name, label),
+                decode=read_transposed_parquet,
                 headers={"accept": "application/x-parquet"},
                 params=params,
             )
-            stream = io.BytesIO(resp.content)
-            df = pd.read_parquet(stream).transpose()
-            return df
+        except DataLoaderException as e:
+            logger.error(e)
+            return pd.DataFrame()
+
+    def get_ensemble_parameter_group_data(
+        self,
+        ensemble_id: str,
+        group_name: str,
+    ) -> pd.DataFrame:
+        """
+        Fetches every label of a labelled parameter record in one request,
+        one column per label
+        """
+        try:
+            return self._fetch(
+                url=f"ensembles/{ensemble_id}/records/{group_name}",
+                cache_key=("record", self.baseurl, str(ensemble_id), group_name, None),
+                decode=read_transposed_parquet,
+                headers={"accept": "application/x-parquet"},
+                params={},
+            )
         except DataLoaderException as e:
             logger.error(e)
             return pd.DataFrame()
@@ -259,36 +930,237 @@ class DataLoader:
         self,
         ensemble_id: str,
         record_name: str,
+        sent: Optional[requests.Response] = None,
+    ) -> pd.DataFrame:
+        """
+        Frame of a response record, one row per x-axis index and one column
+        per realization. The payload may have been `sent` already, see
+        `_open_parquet`.
+        """
+        store_key = (self.baseurl, str(ensemble_id), record_name)
+        if self.record_store is None:
+            return self._load_record_data(ensemble_id, record_name, sent=sent)
+
+        df = self.record_store.read(store_key)
+        self.metrics.observe_cache("records", "record_store", hit=df is not None)
+        if df is not None and self.record_store.is_finished(store_key):
+            return df
+        # Worker processes sharing the store take turns, so that a record
+        # is downloaded and decoded by one of them and mapped by the others
+        with self.record_store.lock(store_key):
+            stored = self.record_store.read(store_key)
+            if stored is None or sent is not None:
+                df = self._load_record_data(ensemble_id, record_name, sent=sent)
+            elif self.record_store.is_finished(store_key):
+                return stored
+            else:
+                # A record of a running ensemble is only served once the
+                # server confirms it is unchanged
+                validators = self.record_store.validators(store_key)
+                df = self._load_record_data(
+                    ensemble_id, record_name, (validators, stored)
+                )
+                if df is stored:
+                    return df
+            cache_key = ("record", self.baseurl, str(ensemble_id), record_name, None)
+            if self.record_store.write(store_key, df, self._validators(cache_key)):
+                # Hand out the mapped copy, so the decoded frame can be released
+                mapped = self.record_store.read(store_key)
+                if mapped is not None:
+                    return mapped
+        return df
+
+    def _load_record_data(
+        self,
+        ensemble_id: str,
+        record_name: str,
+        stored: Optional[Tuple[Validators, pd.DataFrame]] = None,
+        sent: Optional[requests.Response] = None,
     ) -> pd.DataFrame:
         try:
-            resp = self._get(
+            df = self._fetch(
                 url=f"ensembles/{ensemble_id}/records/{record_name}",
+                cache_key=("record", self.baseurl, str(ensemble_id), record_name, None),
+                decode=_decode_record_data,
                 headers={"accept": "application/x-parquet"},
+                stored=stored,
+                sent=sent,
             )
-            stream = io.BytesIO(resp.content)
-            df = pd.read_parquet(stream).transpose()
-
         except DataLoaderException as e:
             logger.error(e)
             return pd.DataFrame()
+        return df
+
+    @property
+    def supports_projection(self) -> bool:
+        """
+        Whether parts of a record can be fetched without downloading all of
+        it, which is unknown (assumed) until a projection has been fetched.
+        Otherwise loading the whole record once is cheaper.
+        """
+        return self._range_requests is not False
 
+    def get_ensemble_record_axis(
+        self, ensemble_id: str, record_name: str
+    ) -> Tuple[pd.Index, Optional[pd.DataFrame]]:
+        """
+        Sorted x-axis of a record, read from its footer, and the whole record
+        if the server sent all of it
+        """
+        store_key = (self.baseurl, str(ensemble_id), record_name)
+        if self.record_store is not None and self.record_store.is_finished(store_key):
+            df = self.record_store.read(store_key)
+            if df is not None:
+                return df.index, df
+
+        url = f"ensembles/{ensemble_id}/records/{record_name}"
+        cache_key = ("record", self.baseurl, str(ensemble_id), record_name, None)
         try:
-            df.index = df.index.astype(int)
-        except TypeError:
-            pass
-        df = df.sort_index()
-        return df
+            parquet = self._open_parquet(url, cache_key)
+        except (DataLoaderException, OSError, pa.ArrowException) as e:
+            logger.error(e)
+            return pd.Index([]), None
+        if not isinstance(parquet, pq.ParquetFile):
+            df = self.get_ensemble_record_data(ensemble_id, record_name, sent=parquet)
+            return df.index, df
+        try:
+            return _record_index(column_labels(parquet)).sort_values(), None
+        except (OSError, pa.ArrowException) as e:
+            logger.error(e)
+            return pd.Index([]), None
+
+    def get_ensemble_record_projection(
+        self,
+        ensemble_id: str,
+        record_name: str,
+        x_indexes: Optional[Sequence[int]] = None,
+        realizations: Optional[Sequence[int]] = None,
+    ) -> pd.DataFrame:
+        """
+        Rows at the x-axis positions and columns at the realization positions
+        of the record, downloading only the needed column chunks
+        """
+        store_key = (self.baseurl, str(ensemble_id), record_name)
+        if self.record_store is not None and self.record_store.is_finished(store_key):
+            df = self.record_store.read(store_key)
+            if df is not None:
+                return df.iloc[
+                    slice(None) if x_indexes is None else list(x_indexes),
+                    slice(None) if realizations is None else list(realizations),
+                ]
+
+        url = f"ensembles/{ensemble_id}/records/{record_name}"
+        cache_key = ("record", self.baseurl, str(ensemble_id), record_name, None)
+        had_footer = url in self._parquet_metadata_cache
+        try:
+            parquet = self._open_parquet(url, cache_key)
+            if not isinstance(parquet, pq.ParquetFile):
+                df = self.get_ensemble_record_data(
+                    ensemble_id, record_name, sent=parquet
+                )
+                if df.empty:
+                    return df
+                return df.iloc[
+                    slice(None) if x_indexes is None else list(x_indexes),
+                    slice(None) if realizations is None else list(realizations),
+                ]
+            return _project_record_data(parquet, x_indexes, realizations)
+        except (DataLoaderException, OSError, pa.ArrowException) as e:
+            if had_footer and url not in self._parquet_metadata_cache:
+                # The payload changed since its footer was read, start over
+                return self.get_ensemble_record_projection(
+                    ensemble_id, record_name, x_indexes, realizations
+                )
+            logger.error(e)
+            return pd.DataFrame()
+
+    def _open_parquet(
+        self, url: str, cache_key: DiskCacheKey
+    ) -> Union[pq.ParquetFile, requests.Response]:
+        """
+        Opens a parquet payload for reading parts of it with range requests,
+        or returns the response of a server that sent all of it instead
+        """
+        content = None
+        if self.disk_cache is not None:
+            content = self.disk_cache.get(cache_key)
+            if content is not None and self.disk_cache.is_finished(cache_key):
+                return pq.ParquetFile(pa.BufferReader(content), pre_buffer=False)
+
+        headers = {"accept": "application/x-parquet"}
+        cached = self._parquet_metadata_cache.get(url)
+        if cached is not None:
+            size, etag, metadata = cached
+            segments = {}
+        else:
+            # Concurrent callers, e.g. plots of several ensembles, share
+            # one probe of the server
+            resp = self._single_flight(
+                ("footer", url),
+                partial(
+                    self._get,
+                    url=url,
+                    headers={**headers, "Range": f"bytes=-{PARQUET_TAIL_BYTES}"},
+                ),
+            )
+            self._range_requests = resp.status_code == 206
+            if resp.status_code == 200:
+                return resp
+            etag = resp.headers.get("ETag")
+            if self.disk_cache is not None and content is not None and etag:
+                # The footer request revalidates the stored payload
+                if etag == self.disk_cache.validators(cache_key)[0]:
+                    return pq.ParquetFile(pa.BufferReader(content), pre_buffer=False)
+            size = _content_range_size(resp)
+            metadata = None
+            segments = {size - len(resp.content): resp.content}
+
+        remote = RangeFile(
+            size, partial(self._get_range, url, headers, size, etag), segments
+        )
+        parquet = pq.ParquetFile(remote, metadata=metadata, pre_buffer=False)
+        self._parquet_metadata_cache.put(url, (size, etag, parquet.metadata))
+        return parquet
+
+    def _get_range(
+        self,
+        url: str,
+        headers: dict,
+        size: int,
+        etag: Optional[str],
+        start: int,
+        stop: int,
+    ) -> bytes:
+        resp = self._get(
+            url=url, headers={**headers, "Range": f"bytes={start}-{stop - 1}"}
+        )
+        changed = resp.status_code != 206 or _content_range_size(resp) != size
+        if changed or resp.headers.get("ETag") != etag:
+            self._parquet_metadata_cache.pop(url)
+            raise DataLoaderException(f"{self.baseurl}/{url} changed while reading it")
+        return resp.content
 
     def get_ensemble_record_observations(
-        self, ensemble_id: str, record_name: str
+        self, ensemble_id: str, record_name: str, strict: bool = False
     ) -> List[dict]:
+        """With `strict`, failures are raised instead of logged"""
         try:
-            return self._get(
+            return self._fetch(
                 url=f"ensembles/{ensemble_id}/records/{record_name}/observations",
+                cache_key=(
+                    "observations",
+                    self.baseurl,
+                    str(ensemble_id),
+                    record_name,
+                    None,
+                ),
+                decode=json.loads,
                 # Hard coded to zero, as all realizations are connected to the same observations
                 params={"realization_index": 0},
-            ).json()
+            )
         except DataLoaderException as e:
+            if strict:
+                raise
             logger.error(e)
             return list()
 
@@ -296,25 +1168,139 @@ class DataLoader:
         self, ensemble_id: str, response_name: str, summary: bool
     ) -> pd.DataFrame:
         try:
-            resp = self._get(
+            return self._fetch(
                 "compute/misfits",
+                cache_key=(
+                    "summary_misfits" if summary else "misfits",
+                    self.baseurl,
+                    str(ensemble_id),
+                    response_name,
+                    None,
+                ),
+                decode=_decode_misfits,
+                headers={"accept": "application/x-parquet, text/csv;q=0.5"},
                 params={
                     "ensemble_id": ensemble_id,
                     "response_name": response_name,
                     "summary_misfits": summary,
                 },
             )
-            stream = io.BytesIO(resp.content)
-            df = pd.read_csv(stream, index_col=0, float_precision="round_trip")
-            return df
         except DataLoaderException as e:
             logger.error(e)
             return pd.DataFrame()
 
 
 def get_data_loader(project_id: Optional[str] = None) -> DataLoader:
-    return DataLoader(*(get_connection_info(project_id).values()))
+    connection_info = get_connection_info(project_id)
+    return DataLoader(
+        connection_info["baseurl"],
+        connection_info["auth"],
+        pool_size=int(os.getenv(POOL_SIZE_ENV, DEFAULT_POOL_SIZE)),
+        timeout=float(os.getenv(TIMEOUT_ENV, DEFAULT_TIMEOUT)),
+        max_concurrency=int(os.getenv(MAX_CONCURRENCY_ENV, DEFAULT_MAX_CONCURRENCY)),
+    )
 
 
 def get_ensembles(project_id: Optional[str] = None) -> list:
     return get_data_loader(project_id).get_all_ensembles()
+
+
+def get_ensemble_catalogue(project_id: Optional[str] = None) -> List[dict]:
+    return get_data_loader(project_id).get_ensemble_catalogue()
+
+
+def metrics_exposition() -> str:
+    """
+    Request metrics of every DataLoader in the Prometheus text format, as
+    served on the `/metrics` route
+    """
+    families = {**METRIC_FAMILIES, "webviz_ert_resident_bytes": "gauge"}
+    # The samples of a family are grouped under its type, across loaders
+    samples: Dict[str, List[str]] = {name: [] for name in families}
+    for (baseurl, _), loader in list(DataLoader._instances.items()):
+        exposition = loader.metrics.exposition(labels=f'server="{baseurl}"')
+        for name, lines in exposition.items():
+            samples[name].extend(lines)
+        for ensemble_id, nbytes in sorted(loader.memory.resident_bytes().items()):
+            samples["webviz_ert_resident_bytes"].append(
+                f'webviz_ert_resident_bytes{{server="{baseurl}",'
+                f'ensemble="{ensemble_id}"}} {nbytes}'
+            )
+    lines = []
+    for name, metric_type in families.items():
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
+
+
+def log_metrics_summary() -> None:
+    for (baseurl, _), loader in list(DataLoader._instances.items()):
+        summary = loader.metrics.summary()
+        if summary:
+            logger.info(
+                "webviz-ert request metrics: "
+                + json.dumps(
+                    {
+                        "server": baseurl,
+                        "endpoints": summary,
+                        "memory": loader.memory.stats(),
+                        "resident_bytes": loader.memory.resident_bytes(),
+                    }
+                )
+            )
+
+
+_metrics_log_lock = threading.Lock()
+_metrics_log_thread: Optional[threading.Thread] = None
+# Interval of the running metrics log, restarted in forked processes
+_metrics_log_interval: Optional[float] = None
+
+
+def start_metrics_log(interval: Optional[float] = None) -> None:
+    """
+    Logs `log_metrics_summary` every `interval` seconds from a daemon
+    thread, started once per process
+    """
+    global _metrics_log_thread, _metrics_log_interval
+    if interval is None:
+        interval = float(
+            os.getenv(METRICS_LOG_INTERVAL_ENV, DEFAULT_METRICS_LOG_INTERVAL)
+        )
+    if interval <= 0:
+        return
+
+    def log_periodically() -> None:
+        while True:
+            time.sleep(interval)
+            log_metrics_summary()
+
+    with _metrics_log_lock:
+        if _metrics_log_thread is not None:
+            return
+        _metrics_log_thread = threading.Thread(
+            target=log_periodically, name="webviz-ert-metrics", daemon=True
+        )
+        _metrics_log_thread.start()
+        _metrics_log_interval = interval
+
+
+def _reset_after_fork() -> None:
+    """
+    Forked worker processes (e.g. gunicorn with --preload) start with fresh
+    loaders, as the parent's locks, connections and threads are unusable.
+    The metrics log thread, if the parent ran one, is started again.
+    """
+    global _connection_info_lock, _metrics_log_lock, _metrics_log_thread
+    global _metrics_log_interval
+    _connection_info_lock = threading.Lock()
+    _metrics_log_lock = threading.Lock()
+    _metrics_log_thread = None
+    interval, _metrics_log_interval = _metrics_log_interval, None
+    DataLoader._instances_lock = threading.Lock()
+    DataLoader._instances.clear()
+    if interval is not None:
+        start_metrics_log(interval)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,132 @@
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Number of parquet columns decoded at a time. Decoding a few hundred
+# columns at once keeps the reader's scratch memory small.
+COLUMN_BATCH_SIZE = 256
+
+
+def _row_groups(
+    parquet: pq.ParquetFile, rows: Optional[Sequence[int]]
+) -> Tuple[List[int], Optional[np.ndarray]]:
+    """
+    Row groups holding the given stored rows, and the positions of the rows
+    within those row groups
+    """
+    metadata = parquet.metadata
+    if rows is None:
+        return list(range(metadata.num_row_groups)), None
+    sizes = [
+        metadata.row_group(group).num_rows for group in range(metadata.num_row_groups)
+    ]
+    ends = np.cumsum(sizes)
+    positions = np.asarray(rows, dtype=np.int64)
+    owner = np.searchsorted(ends, positions, side="right")
+    groups = np.unique(owner)
+    # Offset of each stored row group within the ones that are read
+    offsets = np.zeros(len(sizes), dtype=np.int64)
+    offsets[groups] = np.cumsum([0] + [sizes[group] for group in groups[:-1]])
+    return groups.tolist(), positions - (ends - sizes)[owner] + offsets[owner]
+
+
+def _stored_index(
+    parquet: pq.ParquetFile,
+    index_columns: List,
+    groups: List[int],
+    group_rows: Optional[np.ndarray],
+    rows: Optional[Sequence[int]],
+) -> pd.Index:
+    if not index_columns:
+        index = pd.RangeIndex(parquet.metadata.num_rows)
+    elif len(index_columns) > 1:
+        raise ValueError("Multi-level record indexes are not supported")
+    elif isinstance(index_columns[0], dict):
+        (index,) = index_columns
+        index = pd.RangeIndex(
+            index["start"], index["stop"], index["step"], name=index.get("name")
+        )
+    else:
+        (name,) = index_columns
+        table = parquet.read_row_groups(groups, columns=[name], use_threads=False)
+        values = table.column(name).to_numpy(zero_copy_only=False)
+        return pd.Index(values if group_rows is None else values[group_rows])
+    return index if rows is None else index[list(rows)]
+
+
+def column_labels(parquet: pq.ParquetFile) -> pd.Index:
+    """
+    Labels of the stored data columns, as reconstructed by pandas, read
+    from the footer only
+    """
+    # An empty table carries the same pandas metadata, so it gives the
+    # reconstructed column labels without converting any data.
+    return parquet.schema_arrow.empty_table().to_pandas().columns
+
+
+def read_transposed_parquet(
+    content: Union[bytes, pq.ParquetFile],
+    columns: Optional[Sequence[int]] = None,
+    rows: Optional[Sequence[int]] = None,
+) -> pd.DataFrame:
+    """
+    Same as `pd.read_parquet(io.BytesIO(content)).transpose()`, limited to
+    the stored `columns` and `rows` positions, without copying twice
+    """
+    if isinstance(content, bytes):
+        parquet = pq.ParquetFile(pa.BufferReader(content), pre_buffer=False)
+    else:
+        parquet = content
+    schema = parquet.schema_arrow
+    metadata = schema.pandas_metadata or {}
+    index_columns = metadata.get("index_columns", [])
+    stored = [name for name in index_columns if isinstance(name, str)]
+    data_columns = [name for name in schema.names if name not in stored]
+    labels = column_labels(parquet)
+    if columns is not None:
+        data_columns = [data_columns[column] for column in columns]
+        labels = labels[list(columns)]
+    groups, group_rows = _row_groups(parquet, rows)
+
+    dtype = np.dtype(object)
+    if data_columns:
+        try:
+            dtype = np.result_type(
+                *[schema.field(name).type.to_pandas_dtype() for name in data_columns]
+            )
+        except (NotImplementedError, TypeError):
+            pass
+    if dtype.kind not in "iuf":
+        table = parquet.read_row_groups(
+            groups, columns=data_columns, use_threads=False, use_pandas_metadata=True
+        )
+        df = table.to_pandas()
+        if group_rows is not None:
+            df = df.iloc[group_rows]
+        return df.transpose()
+
+    num_rows = (
+        sum(parquet.metadata.row_group(group).num_rows for group in groups)
+        if group_rows is None
+        else len(group_rows)
+    )
+    values = np.empty((len(data_columns), num_rows), dtype=dtype)
+    for start in range(0, len(data_columns), COLUMN_BATCH_SIZE):
+        names = data_columns[start : start + COLUMN_BATCH_SIZE]
+        batch = parquet.read_row_groups(groups, columns=names, use_threads=False)
+        for row, name in enumerate(names, start=start):
+            column = batch.column(name)
+            if column.null_count and values.dtype.kind != "f":
+                values = values.astype(np.float64)
+            decoded = column.to_numpy()
+            values[row] = decoded if group_rows is None else decoded[group_rows]
+
+    return pd.DataFrame(
+        values,
+        index=labels,
+        columns=_stored_index(parquet, index_columns, groups, group_rows, rows),
+        copy=False,
+    )
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Set
+
+# Seconds between rescans of a cache directory for files written or evicted
+# by other processes, unless the size cap would be exceeded earlier
+RESCAN_INTERVAL = 60.0
+
+
+class CacheDirectory:
+    """
+    Cache files of ensembles in a directory other processes may share, the
+    least recently used evicted beyond `max_bytes`
+    """
+
+    # Files not counted as cache entries, e.g. their sidecars
+    skip_suffix = ""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._running: Set[str] = set()
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        self._sizes = scan_sizes(self.directory, skip_suffix=self.skip_suffix)
+        self._scanned = time.monotonic()
+
+    def set_finished(self, ensemble_id: str, finished: bool) -> None:
+        """Whether the files of an ensemble can no longer change, the default"""
+        with self._lock:
+            if finished:
+                self._running.discard(str(ensemble_id))
+            else:
+                self._running.add(str(ensemble_id))
+
+    def _write(self, path: str, write: Callable[[str], None]) -> int:
+        """
+        Writes a file with `write` to a temporary path, moved into place
+        once complete, returning its size
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Temporary files are not counted, so would never be evicted
+            unlink(tmp_path)
+            raise
+        return size
+
+    def _added(self, path: str, size: int) -> None:
+        with self._lock:
+            self._sizes[path] = size
+            over_cap = sum(self._sizes.values()) > self.max_bytes
+            if over_cap or time.monotonic() - self._scanned > RESCAN_INTERVAL:
+                # Other processes sharing the directory may have filled it, or
+                # evicted files already
+                self._scan()
+            evict_least_recently_used(self._sizes, self.max_bytes, self._remove)
+
+    def _remove(self, path: str) -> None:
+        unlink(path)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+
+def scan_sizes(directory: str, skip_suffix: str) -> Dict[str, int]:
+    """
+    Sizes of the files in the directory, including other processes', except
+    temporary files and those ending with `skip_suffix`
+    """
+    sizes = {}
+    for entry in os.scandir(directory):
+        try:
+            if entry.name.startswith("."):
+                continue
+            if skip_suffix and entry.name.endswith(skip_suffix):
+                continue
+            if entry.is_file():
+                sizes[entry.path] = entry.stat().st_size
+        except OSError:
+            # Evicted by another process meanwhile
+            continue
+    return sizes
+
+
+def evict_least_recently_used(
+    sizes: Dict[str, int], max_bytes: int, remove: Callable[[str], None]
+) -> None:
+    """
+    Removes the least recently used (modified or read, which touches the
+    file) files of `sizes` until they take at most `max_bytes`
+    """
+    total = sum(sizes.values())
+    if total <= max_bytes:
+        return
+
+    def _last_used(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return 0.0
+
+    for path in sorted(sizes, key=_last_used):
+        if total <= max_bytes:
+            break
+        total -= sizes.pop(path)
+        remove(path)
+
+
+def unlink(path: str) -> None:
+    """Removes a file, if still there"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Callable, Optional, Tuple
+
+from webviz_ert.data_loader._cache_directory import CacheDirectory, unlink
+
+logger = logging.getLogger()
+
+# (kind, baseurl, ensemble id, record name, label)
+DiskCacheKey = Tuple[str, str, str, str, Optional[str]]
+# ETag and Last-Modified of a payload, see `DiskCache.validators`
+Validators = Tuple[Optional[str], Optional[str]]
+
+VALIDATORS_SUFFIX = ".validators"
+
+
+class DiskCache(CacheDirectory):
+    """Raw payloads kept on disk with their validators, across restarts"""
+
+    skip_suffix = VALIDATORS_SUFFIX
+
+    def _path(self, key: DiskCacheKey) -> str:
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        suffix = {"record": ".parquet", "observations": ".json"}.get(key[0], ".dat")
+        return os.path.join(self.directory, digest + suffix)
+
+    def is_finished(self, key: DiskCacheKey) -> bool:
+        return key[2] not in self._running
+
+    def validators(self, key: DiskCacheKey) -> Validators:
+        """ETag and Last-Modified the payload was served with, if any"""
+        try:
+            with open(self._path(key) + VALIDATORS_SUFFIX) as f:
+                etag, last_modified = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        return etag, last_modified
+
+    def get(self, key: DiskCacheKey) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return content
+
+    def put(
+        self, key: DiskCacheKey, content: bytes, validators: Validators = (None, None)
+    ) -> None:
+        if len(content) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            # Validators first, so they never outlive the payload they were
+            # served with, which would then pass revalidation
+            self._remove(path)
+            if any(validators):
+                self._write(
+                    path + VALIDATORS_SUFFIX,
+                    _bytes_writer(json.dumps(validators).encode()),
+                )
+            size = self._write(path, _bytes_writer(content))
+        except OSError as e:
+            logger.warning(f"Unable to write {path} to the record cache: {e}")
+            return
+        self._added(path, size)
+
+    def _remove(self, path: str) -> None:
+        unlink(path)
+        unlink(path + VALIDATORS_SUFFIX)
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._sizes:
+                self._remove(path)
+            self._sizes.clear()
+
+
+def _bytes_writer(content: bytes) -> Callable[[str], None]:
+    def _write(path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(content)
+
+    return _write
@@ -0,0 +1,126 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+
+def frame_bytes(frame: Optional[Any]) -> int:
+    """Bytes held by the values and index of a frame or series"""
+    if frame is None:
+        return 0
+    usage = frame.memory_usage(index=True, deep=False)
+    return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+
+class MemoryBudget:
+    """
+    Evicts the least recently used data of models, weakly referenced, once
+    they hold over `max_bytes` (0 never evicts) by calling `owner.evict`.
+    That may run while the owner is in use, so `evict` takes no locks and
+    owners read evictable attributes into a local once.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (owner reference, name) -> (ensemble id, bytes), least recently
+        # used first
+        self._entries: "OrderedDict[Tuple[weakref.ref, str], Tuple[str, int]]" = (
+            OrderedDict()
+        )
+        # References of collected owners, whose entries are forgotten the
+        # next time the budget is used. The callback may run in any thread,
+        # also one holding the lock, so it does not take it.
+        self._collected: List[weakref.ref] = []
+        self._total = 0
+        self._evictions = 0
+
+    def _key(self, owner: Any, name: str) -> Tuple[weakref.ref, str]:
+        return weakref.ref(owner, self._collected.append), name
+
+    def _forget_collected(self) -> None:
+        while self._collected:
+            collected = self._collected.pop()
+            for key in [key for key in self._entries if key[0] is collected]:
+                self._total -= self._entries.pop(key)[1]
+
+    def charge(self, owner: Any, name: str, ensemble_id: Any, nbytes: int) -> None:
+        """Records that `owner` holds `nbytes` under `name`, evicting if needed"""
+        key = self._key(owner, name)
+        with self._lock:
+            self._forget_collected()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= previous[1]
+            self._entries[key] = (str(ensemble_id), nbytes)
+            self._total += nbytes
+            victims = self._victims(keep=key)
+        self._evict(victims)
+
+    def _evict(self, victims: List[Tuple[weakref.ref, str]]) -> None:
+        # Outside the lock, so evicting never waits on the budget
+        for ref, name in victims:
+            owner = ref()
+            if owner is not None:
+                owner.evict(name)
+
+    def _victims(self, keep: Hashable) -> List[Tuple[weakref.ref, str]]:
+        victims: List[Tuple[weakref.ref, str]] = []
+        if not self.max_bytes:
+            return victims
+        for key in list(self._entries):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._total -= self._entries.pop(key)[1]
+            self._evictions += 1
+            victims.append(key)
+        return victims
+
+    def touch(self, owner: Any, name: str) -> None:
+        """Marks the data as recently used"""
+        key = self._key(owner, name)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def release(self, owner: Any, name: str) -> None:
+        """Forgets data the owner dropped by itself"""
+        with self._lock:
+            entry = self._entries.pop(self._key(owner, name), None)
+            if entry is not None:
+                self._total -= entry[1]
+
+    def evict_ensemble(self, ensemble_id: Any) -> None:
+        """Drops all data held for an ensemble, e.g. once it is unregistered"""
+        with self._lock:
+            victims = [
+                key
+                for key, (entry_id, _) in self._entries.items()
+                if entry_id == str(ensemble_id)
+            ]
+            for key in victims:
+                self._total -= self._entries.pop(key)[1]
+        self._evict(victims)
+
+    def resident_bytes(self) -> Dict[str, int]:
+        """Bytes held per ensemble id"""
+        resident: Dict[str, int] = {}
+        with self._lock:
+            self._forget_collected()
+            for ensemble_id, nbytes in self._entries.values():
+                resident[ensemble_id] = resident.get(ensemble_id, 0) + nbytes
+        return resident
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._forget_collected()
+            return {
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "entries": len(self._entries),
+                "evictions": self._evictions,
+            }
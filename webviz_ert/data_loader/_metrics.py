@@ -0,0 +1,155 @@
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+# Metric families of `Metrics.exposition`, with their Prometheus types
+METRIC_FAMILIES = {
+    "webviz_ert_request_seconds": "histogram",
+    "webviz_ert_decode_seconds": "histogram",
+    "webviz_ert_response_bytes_total": "counter",
+    "webviz_ert_request_errors_total": "counter",
+    "webviz_ert_cache_requests_total": "counter",
+}
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ENDPOINT_CLASSES = [
+    (re.compile(r"^ensembles/[^/]+/records/[^/]+/observations$"), "observations"),
+    (re.compile(r"^ensembles/[^/]+/records/[^/]+/labels$"), "labels"),
+    (re.compile(r"^ensembles/[^/]+/records/[^/]+$"), "records"),
+    (re.compile(r"^ensembles/[^/]+/(responses|parameters|userdata)$"), r"\1"),
+    (re.compile(r"^compute/misfits$"), "misfits"),
+]
+
+
+def endpoint_class(url: str) -> str:
+    """Groups request URLs by endpoint, leaving out ensemble and record names"""
+    for pattern, name in _ENDPOINT_CLASSES:
+        match = pattern.match(url)
+        if match:
+            return match.expand(name)
+    return "other"
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        total = 0
+        buckets = []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "seconds": round(self.sum, 6),
+            "mean_seconds": round(self.sum / self.count, 6) if self.count else 0.0,
+        }
+
+
+class Metrics:
+    """
+    Request latency and payload size per endpoint class, time spent
+    decoding payloads, and cache hits and misses, of one DataLoader
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latency: Dict[str, _Histogram] = defaultdict(_Histogram)
+        self._decoding: Dict[str, _Histogram] = defaultdict(_Histogram)
+        self._bytes: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._cache: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def observe_request(
+        self, endpoint: str, seconds: float, nbytes: int, failed: bool = False
+    ) -> None:
+        with self._lock:
+            self._latency[endpoint].observe(seconds)
+            self._bytes[endpoint] += nbytes
+            if failed:
+                self._errors[endpoint] += 1
+
+    def observe_decode(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._decoding[endpoint].observe(seconds)
+
+    def observe_cache(self, endpoint: str, cache: str, hit: bool) -> None:
+        with self._lock:
+            self._cache[(endpoint, cache, "hit" if hit else "miss")] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Totals per endpoint class, e.g. for a structured log line"""
+        with self._lock:
+            endpoints = (
+                set(self._latency)
+                | set(self._decoding)
+                | {key[0] for key in self._cache}
+            )
+            summary: Dict[str, Dict[str, Any]] = {}
+            for endpoint in sorted(endpoints):
+                entry: Dict[str, Any] = {
+                    "requests": self._latency.get(endpoint, _Histogram()).summary(),
+                    "bytes": self._bytes.get(endpoint, 0),
+                    "errors": self._errors.get(endpoint, 0),
+                    "decoding": self._decoding.get(endpoint, _Histogram()).summary(),
+                }
+                for (name, cache, result), count in self._cache.items():
+                    if name == endpoint:
+                        entry.setdefault("cache", {}).setdefault(cache, {})[
+                            result
+                        ] = count
+                summary[endpoint] = entry
+            return summary
+
+    def exposition(self, labels: str = "") -> Dict[str, List[str]]:
+        """
+        Sample lines in the Prometheus text format by metric family, see
+        `METRIC_FAMILIES`, without type headers
+        """
+        prefix = f"{labels}," if labels else ""
+        samples: Dict[str, List[str]] = {name: [] for name in METRIC_FAMILIES}
+        with self._lock:
+            for name, histograms in (
+                ("webviz_ert_request_seconds", self._latency),
+                ("webviz_ert_decode_seconds", self._decoding),
+            ):
+                lines = samples[name]
+                for endpoint, histogram in sorted(histograms.items()):
+                    label = f'{prefix}endpoint="{endpoint}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+            for endpoint, nbytes in sorted(self._bytes.items()):
+                samples["webviz_ert_response_bytes_total"].append(
+                    f'webviz_ert_response_bytes_total{{{prefix}endpoint="{endpoint}"}} '
+                    f"{nbytes}"
+                )
+            for endpoint, errors in sorted(self._errors.items()):
+                samples["webviz_ert_request_errors_total"].append(
+                    f'webviz_ert_request_errors_total{{{prefix}endpoint="{endpoint}"}} '
+                    f"{errors}"
+                )
+            for (endpoint, cache, result), count in sorted(self._cache.items()):
+                samples["webviz_ert_cache_requests_total"].append(
+                    f"webviz_ert_cache_requests_total{{{prefix}"
+                    f'endpoint="{endpoint}",cache="{cache}",result="{result}"}} '
+                    f"{count}"
+                )
+        return samples
@@ -0,0 +1,139 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger()
+
+# Prefetch priorities, lower runs first
+PRIORITY_LISTING = 0
+PRIORITY_OBSERVATIONS = 1
+PRIORITY_RECORDS = 2
+
+# Seconds without foreground requests before prefetching resumes
+FOREGROUND_QUIET_SECONDS = 0.2
+
+
+class PrefetchScheduler:
+    """
+    Runs prefetch tasks by priority on up to `max_workers` threads, none
+    starting during or shortly after a foreground request. A task is queued
+    once per key until it has finished.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._condition = threading.Condition()
+        self._queue: List[Tuple[int, int, Hashable, Callable[[], Any]]] = []
+        self._keys: Set[Hashable] = set()
+        self._order = itertools.count()
+        self._workers: List[threading.Thread] = []
+        self._local = threading.local()
+        self._foreground = 0
+        self._foreground_ended = 0.0
+        self._closed = False
+        self._views: Counter = Counter()
+        self._stats = {"queued": 0, "completed": 0, "failed": 0, "hits": 0}
+
+    def is_prefetching(self) -> bool:
+        """Whether the calling thread is running a prefetch task"""
+        return getattr(self._local, "prefetching", False)
+
+    def submit(self, key: Hashable, task: Callable[[], Any], priority: int) -> None:
+        with self._condition:
+            if self._closed or key in self._keys:
+                return
+            self._keys.add(key)
+            heapq.heappush(self._queue, (priority, next(self._order), key, task))
+            self._stats["queued"] += 1
+            if len(self._workers) < min(self.max_workers, len(self._queue)):
+                worker = threading.Thread(
+                    target=self._work, name="webviz-ert-prefetch", daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+
+    def foreground_started(self) -> None:
+        if self.is_prefetching():
+            return
+        with self._condition:
+            self._foreground += 1
+
+    def foreground_finished(self) -> None:
+        if self.is_prefetching():
+            return
+        with self._condition:
+            self._foreground -= 1
+            self._foreground_ended = time.monotonic()
+            self._condition.notify_all()
+
+    def _next_task(self) -> Optional[Tuple[Hashable, Callable[[], Any]]]:
+        """Waits for a task to be due, returns None once closed"""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                quiet = (
+                    self._foreground_ended + FOREGROUND_QUIET_SECONDS - time.monotonic()
+                )
+                if self._queue and not self._foreground and quiet <= 0:
+                    _, _, key, task = heapq.heappop(self._queue)
+                    return key, task
+                self._condition.wait(timeout=quiet if quiet > 0 else None)
+
+    def _work(self) -> None:
+        self._local.prefetching = True
+        while True:
+            next_task = self._next_task()
+            if next_task is None:
+                return
+            key, task = next_task
+            try:
+                task()
+            except Exception as e:
+                logger.warning(f"Prefetching failed: {e}")
+                result = "failed"
+            else:
+                result = "completed"
+            with self._condition:
+                self._keys.discard(key)
+                self._stats[result] += 1
+
+    def record_view(self, name: str) -> None:
+        """Counts a foreground view of a record, see `most_viewed`"""
+        with self._condition:
+            self._views[name] += 1
+
+    def most_viewed(self, n: int) -> List[str]:
+        with self._condition:
+            return [name for name, _ in self._views.most_common(n)]
+
+    def track_load(self, prefetched: Set[str], name: str) -> None:
+        """Remembers in the model's `prefetched` set if a prefetch loaded `name`"""
+        if self.is_prefetching():
+            prefetched.add(name)
+
+    def track_use(self, prefetched: Set[str], name: str) -> None:
+        """Counts a hit when the foreground first reads prefetched `name`"""
+        if name not in prefetched or self.is_prefetching():
+            return
+        try:
+            prefetched.remove(name)
+        except KeyError:
+            return
+        with self._condition:
+            self._stats["hits"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {**self._stats, "pending": len(self._queue)}
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._condition.notify_all()
@@ -0,0 +1,67 @@
+import io
+from typing import Any, Callable, Dict, Optional
+
+# Smallest number of bytes fetched by one range request, so that the many
+# small reads of a parquet reader do not each become a request
+MIN_RANGE_BYTES = 4 * 1024
+
+
+class RangeFile(io.RawIOBase):
+    """
+    Read-only file over a remote payload of `size` bytes, fetching only the
+    parts read with `fetch(start, stop)`, e.g. a range request
+    """
+
+    def __init__(
+        self,
+        size: int,
+        fetch: Callable[[int, int], bytes],
+        segments: Optional[Dict[int, bytes]] = None,
+    ) -> None:
+        super().__init__()
+        self.size = size
+        self._fetch = fetch
+        self._segments: Dict[int, bytes] = dict(segments or {})
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = self.size + offset
+        return self._position
+
+    def _segment(self, start: int, stop: int) -> memoryview:
+        for offset, content in self._segments.items():
+            if offset <= start and stop <= offset + len(content):
+                return memoryview(content)[start - offset : stop - offset]
+        end = min(max(stop, start + MIN_RANGE_BYTES), self.size)
+        # Only fetch up to a kept part covering the end of the read, like
+        # the tail holding a parquet footer
+        tail = b""
+        for offset, content in self._segments.items():
+            if start < offset < end and stop <= offset + len(content):
+                end, tail = offset, content
+        content = self._fetch(start, end)
+        self._segments[start] = content + tail
+        return memoryview(self._segments[start])[: stop - start]
+
+    def readinto(self, buffer: Any) -> int:
+        stop = min(self._position + len(buffer), self.size)
+        if stop <= self._position:
+            return 0
+        data = self._segment(self._position, stop)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from webviz_ert.data_loader._cache_directory import CacheDirectory, unlink
+from webviz_ert.data_loader._disk_cache import Validators
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger()
+
+# (baseurl, ensemble id, record name)
+RecordStoreKey = Tuple[str, str, str]
+
+LOCK_SUFFIX = ".lock"
+
+
+def _index_to_json(index: pd.Index) -> Dict[str, Any]:
+    values = index.astype(str) if index.dtype.kind == "M" else index
+    return {"values": values.tolist(), "dtype": str(index.dtype), "name": index.name}
+
+
+def _index_from_json(doc: Dict[str, Any]) -> pd.Index:
+    return pd.Index(doc["values"], dtype=doc["dtype"], name=doc["name"])
+
+
+class RecordStore(CacheDirectory):
+    """
+    Keeps decoded record frames in Feather files, handed out memory-mapped
+    so the OS page cache holds them once for all processes
+    """
+
+    skip_suffix = LOCK_SUFFIX
+
+    def _path(self, key: RecordStoreKey) -> str:
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest + ".arrow")
+
+    @contextmanager
+    def lock(self, key: RecordStoreKey) -> Iterator[None]:
+        """
+        Holds an exclusive lock on the entry of `key` across processes, so
+        that only one of them writes it. Without `fcntl` it does nothing.
+        """
+        path = self._path(key)
+        try:
+            fd = _lock_file(path + LOCK_SUFFIX, blocking=True)
+        except OSError as e:
+            logger.warning(f"Unable to lock {path}: {e}")
+            fd = None
+        try:
+            yield
+        finally:
+            if fd is not None:
+                # The lock file lives as long as the record
+                if not os.path.exists(path):
+                    unlink(path + LOCK_SUFFIX)
+                os.close(fd)
+
+    def is_finished(self, key: RecordStoreKey) -> bool:
+        return key[1] not in self._running
+
+    def _read_table(self, key: RecordStoreKey) -> Optional[pa.Table]:
+        path = self._path(key)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            os.utime(path)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        return table
+
+    def validators(self, key: RecordStoreKey) -> Validators:
+        """ETag and Last-Modified the record was served with, if any"""
+        table = self._read_table(key)
+        if table is None:
+            return None, None
+        metadata = json.loads(table.schema.metadata[b"webviz_ert"])
+        etag, last_modified = metadata.get("validators", (None, None))
+        return etag, last_modified
+
+    def read(self, key: RecordStoreKey) -> Optional[pd.DataFrame]:
+        table = self._read_table(key)
+        if table is None:
+            return None
+        metadata = json.loads(table.schema.metadata[b"webviz_ert"])
+        index = _index_from_json(metadata["index"])
+        columns = _index_from_json(metadata["columns"])
+        values = table.column("values")
+        if values.num_chunks:
+            flat = values.chunk(0).to_numpy(zero_copy_only=True)
+        else:
+            flat = np.empty(0, dtype=metadata["dtype"])
+        return pd.DataFrame(
+            flat.reshape(len(columns), len(index)).T,
+            index=index,
+            columns=columns,
+            copy=False,
+        )
+
+    def write(
+        self,
+        key: RecordStoreKey,
+        df: pd.DataFrame,
+        validators: Validators = (None, None),
+    ) -> bool:
+        """
+        Stores the frame, returning False when its values cannot be mapped
+        back (non-numeric or mixed columns)
+        """
+        if df.empty:
+            return False
+        values = df.values
+        if values.dtype.kind not in "iuf":
+            return False
+        metadata = {
+            "index": _index_to_json(df.index),
+            "columns": _index_to_json(df.columns),
+            "dtype": str(values.dtype),
+            "validators": validators,
+        }
+        table = pa.table({"values": pa.array(values.ravel(order="F"))})
+        table = table.replace_schema_metadata(
+            {"webviz_ert": json.dumps(metadata, default=str)}
+        )
+        path = self._path(key)
+        try:
+            size = self._write(
+                path,
+                partial(feather.write_feather, table, compression="uncompressed"),
+            )
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Unable to write {path} to the record store: {e}")
+            return False
+        self._added(path, size)
+        return True
+
+    def _remove(self, path: str) -> None:
+        unlink(path)
+        # The lock file goes too, unless another process is writing the
+        # record again
+        try:
+            fd = _lock_file(path + LOCK_SUFFIX, blocking=False)
+        except OSError:
+            return
+        if fd is not None:
+            if not os.path.exists(path):
+                unlink(path + LOCK_SUFFIX)
+            os.close(fd)
+
+
+def _lock_file(path: str, blocking: bool) -> Optional[int]:
+    """
+    Opens and exclusively locks a lock file, returning its descriptor, or
+    None without `fcntl` or when it is locked already and not `blocking`
+    """
+    if fcntl is None:
+        return None
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(
+                fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            )
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            # Removed by another process while waiting for the lock
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
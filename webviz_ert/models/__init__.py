@@ -1,14 +1,70 @@
-from typing import List, Union, Optional, TYPE_CHECKING
+from typing import (
+    Any,
+    Callable,
+    List,
+    Mapping,
+    Union,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+from functools import partial
 import datetime
+import os
 import dateutil.parser
+import pandas as pd
+from webviz_ert.data_loader import (
+    get_data_loader,
+    LRUCache,
+    PRIORITY_LISTING,
+    PRIORITY_OBSERVATIONS,
+    PRIORITY_RECORDS,
+)
+
+# Number of the most viewed responses prefetched for a selected ensemble
+PREFETCH_RECORDS = 5
+
+# Number of distinct parsed date axes kept, see `indexes_to_axis`
+AXIS_CACHE_SIZE = 256
+
+_parsed_axes = LRUCache(max_entries=AXIS_CACHE_SIZE)
+
+
+def _reset_after_fork() -> None:
+    """Forked processes start with an empty cache, the parent's lock may be held"""
+    global _parsed_axes
+    _parsed_axes = LRUCache(max_entries=AXIS_CACHE_SIZE)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _parse_dates(indexes: Sequence[Any]) -> pd.Index:
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(list(indexes)))
+    except (ValueError, TypeError):
+        # Mixed formats or time zones, parsed one at a time
+        return pd.Index([dateutil.parser.isoparse(str(dt)) for dt in indexes])
 
 
 def indexes_to_axis(
-    indexes: Optional[List[Union[int, str, datetime.datetime]]]
-) -> Optional[List[Union[int, str, datetime.datetime]]]:
+    indexes: Optional[List[Union[int, str, datetime.datetime]]],
+) -> Optional[Sequence[Union[int, str, datetime.datetime]]]:
+    """
+    Parses an axis of ISO date strings into a datetime index, other axes
+    are returned as they are. Parsed axes are interned, so identical axes
+    of several observations and ensembles share one immutable index.
+    """
     try:
         if indexes and type(indexes[0]) is str and not str(indexes[0]).isnumeric():
-            return list(map(lambda dt: dateutil.parser.isoparse(str(dt)), indexes))
+            key = tuple(indexes)
+            axis = _parsed_axes.get(key)
+            if axis is None:
+                axis = _parse_dates(key)
+                _parsed_axes.put(key, axis)
+            return axis
         return indexes
     except ValueError as e:
         raise ValueError("Could not parse indexes as either int or dates", e)
@@ -20,18 +76,139 @@ if TYPE_CHECKING:
 
 
 def load_ensemble(
-    parent_page: "WebvizErtPluginABC", ensemble_id: str
+    parent_page: "WebvizErtPluginABC",
+    ensemble_id: str,
+    schema: Optional[Mapping[str, Any]] = None,
 ) -> "EnsembleModel":
 
     ensemble = parent_page.get_ensemble(ensemble_id=ensemble_id)
     if ensemble is None:
+        if schema is None:
+            entry = parent_page.get_catalogue().get(ensemble_id)
+            schema = entry.schema() if entry is not None else None
         ensemble = EnsembleModel(
-            ensemble_id=ensemble_id, project_id=parent_page.project_identifier
+            ensemble_id=ensemble_id,
+            project_id=parent_page.project_identifier,
+            schema=schema,
+            registry=parent_page,
         )
-        parent_page.add_ensemble(ensemble)
+        # Another callback may have registered the ensemble meanwhile
+        ensemble = parent_page.add_ensemble(ensemble)
     return ensemble
 
 
+def load_catalogue(parent_page: "WebvizErtPluginABC") -> List["EnsembleEntry"]:
+    """
+    Catalogue entries of all the ensembles of the project, fetched once.
+    They are promoted to an `EnsembleModel` by `load_ensemble`.
+    """
+    if not parent_page.get_catalogue():
+        schemas = get_data_loader(
+            parent_page.project_identifier
+        ).get_ensemble_catalogue()
+        parent_page.set_catalogue([EnsembleEntry.from_schema(s) for s in schemas])
+    return list(parent_page.get_catalogue().values())
+
+
+def load_response_data(
+    ensembles: List["EnsembleModel"],
+    response_names: List[str],
+    x_indexes: Optional[Mapping[str, int]] = None,
+    window: Optional[Tuple[Any, Any, Optional[int]]] = None,
+) -> None:
+    """
+    Fetches the data and observations of the named responses for all the
+    given ensembles at once, so that comparing several ensembles takes
+    about as long as the slowest fetch instead of the sum of them.
+
+    When `x_indexes` maps the response names to an x-axis position, only
+    the values at that position are fetched. When `window` gives the
+    (start, end, max_points) of `Response.data_window`, only the values in
+    that window are fetched, along with the observations.
+    """
+    if not ensembles:
+        return
+    data_loader = get_data_loader(ensembles[0].project_id)
+    # The model properties fetch lazily, so reading them loads them
+    data_loader.run_concurrently(
+        [partial(getattr, ensemble, "responses") for ensemble in ensembles]
+    )
+    responses = [
+        ensemble.responses[name]
+        for ensemble in ensembles
+        for name in set(response_names)
+        if name in ensemble.responses
+    ]
+    if x_indexes is not None:
+        data_loader.run_concurrently(
+            [
+                partial(response.data_at, x_indexes[response.name])
+                for response in responses
+            ]
+        )
+        return
+    tasks: List[Callable[[], Any]] = [
+        partial(getattr, response, "observations") for response in responses
+    ]
+    if window is not None:
+        start, end, max_points = window
+        tasks += [
+            partial(response.data_window, start, end, max_points)
+            for response in responses
+        ]
+    else:
+        tasks += [partial(getattr, response, "data") for response in responses]
+    data_loader.run_concurrently(tasks)
+
+
+def prefetch_ensemble(ensemble: "EnsembleModel") -> None:
+    """
+    Queues loading, in the background, what is typically looked at after
+    selecting an ensemble: its response and parameter names first, then
+    the observations of its responses, then the data of the responses
+    viewed most so far (or the first ones, observed responses first)
+    """
+    prefetcher = get_data_loader(ensemble.project_id).prefetcher
+    prefetcher.submit(
+        (ensemble.id, "parameters"),
+        partial(getattr, ensemble, "parameters"),
+        priority=PRIORITY_LISTING,
+    )
+    prefetcher.submit(
+        (ensemble.id, "responses"),
+        partial(_prefetch_responses, ensemble),
+        priority=PRIORITY_LISTING,
+    )
+
+
+def _prefetch_responses(ensemble: "EnsembleModel") -> None:
+    prefetcher = get_data_loader(ensemble.project_id).prefetcher
+    responses = ensemble.responses
+    observed = [
+        response for response in responses.values() if response.has_observations
+    ]
+    for response in observed:
+        prefetcher.submit(
+            (ensemble.id, response.name, "observations"),
+            partial(getattr, response, "observations"),
+            priority=PRIORITY_OBSERVATIONS,
+        )
+    names = [
+        name for name in prefetcher.most_viewed(PREFETCH_RECORDS) if name in responses
+    ]
+    if not names:
+        # Nothing viewed yet, guess the observed responses come first
+        candidates = sorted(responses, key=lambda name: responses[name] not in observed)
+        names = candidates[:PREFETCH_RECORDS]
+    for name in names:
+        prefetcher.submit(
+            (ensemble.id, name, "data"),
+            partial(getattr, responses[name], "data"),
+            priority=PRIORITY_RECORDS,
+        )
+
+
+from .ensemble_entry import EnsembleEntry, LineageIndex
 from .observation import Observation
 from .realization import Realization
 from .response import Response
@@ -45,4 +222,5 @@ from .plot_model import (
     BarChartPlotModel,
 )
 from .parameter_model import PriorModel, ParametersModel
+from .experiment_model import ExperimentModel, clear_experiments, get_experiment
 from .ensemble_model import EnsembleModel
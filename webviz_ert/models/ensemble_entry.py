@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+def ensemble_name(schema: Mapping[str, Any], metadata: Mapping[str, Any]) -> str:
+    """Name given in the ensemble userdata, else experiment name and time"""
+    if "name" in metadata:
+        return metadata["name"]
+    return f"{schema['experiment']['name']}-{schema['timeCreated']}"
+
+
+class EnsembleEntry(NamedTuple):
+    """
+    Compact catalogue record of an ensemble, enough to list it and follow
+    its lineage. A full `EnsembleModel` is only created from it once the
+    ensemble is selected, see `load_ensemble`.
+    """
+
+    id: str
+    name: str
+    experiment_id: str
+    experiment_name: str
+    size: int
+    active_realizations: Tuple[int, ...]
+    time_created: str
+    userdata: str
+    parent_id: Optional[str]
+    children_ids: Tuple[str, ...]
+
+    @classmethod
+    def from_schema(cls, schema: Mapping[str, Any]) -> "EnsembleEntry":
+        parent = schema["parent"]
+        return cls(
+            id=schema["id"],
+            name=ensemble_name(schema, json.loads(schema["userdata"])),
+            experiment_id=schema["experiment"]["id"],
+            experiment_name=schema["experiment"]["name"],
+            size=schema["size"],
+            active_realizations=tuple(schema["activeRealizations"]),
+            time_created=schema["timeCreated"],
+            userdata=schema["userdata"],
+            parent_id=parent["ensembleReference"]["id"] if parent else None,
+            children_ids=tuple(
+                child["ensembleResult"]["id"] for child in schema["children"]
+            ),
+        )
+
+    def schema(self) -> Dict[str, Any]:
+        """The ensemble schema, as returned by `DataLoader.get_ensemble`"""
+        return {
+            "id": self.id,
+            "experiment": {"id": self.experiment_id, "name": self.experiment_name},
+            "size": self.size,
+            "activeRealizations": list(self.active_realizations),
+            "timeCreated": self.time_created,
+            "userdata": self.userdata,
+            "parent": (
+                {"ensembleReference": {"id": self.parent_id}}
+                if self.parent_id is not None
+                else None
+            ),
+            "children": [
+                {"ensembleResult": {"id": child_id}} for child_id in self.children_ids
+            ],
+        }
+
+
+class LineageIndex:
+    """
+    Parent and children of every catalogued ensemble, and the iteration
+    chains they form, e.g. prior -> iter-1 -> iter-2 of an ES-MDA run.
+    Computed once from the catalogue entries.
+    """
+
+    def __init__(self, entries: Iterable[EnsembleEntry]) -> None:
+        self._parents: Dict[Any, Any] = {}
+        self._children: Dict[Any, Tuple[Any, ...]] = {}
+        for entry in entries:
+            self._parents[entry.id] = entry.parent_id
+            self._children[entry.id] = entry.children_ids
+        self._chains: List[List[Any]] = []
+        self._chain_of: Dict[Any, List[Any]] = {}
+        for ensemble_id, parent_id in self._parents.items():
+            if parent_id is None or parent_id not in self._parents:
+                self._add_chains([ensemble_id])
+
+    def _add_chains(self, chain: List[Any]) -> None:
+        children = [
+            child
+            for child in self._children.get(chain[-1], ())
+            # Guards against cycles in broken lineage data
+            if child not in chain
+        ]
+        if not children:
+            self._chains.append(chain)
+            for ensemble_id in chain:
+                self._chain_of.setdefault(ensemble_id, chain)
+        for child in children:
+            self._add_chains(chain + [child])
+
+    def __contains__(self, ensemble_id: Any) -> bool:
+        return ensemble_id in self._parents
+
+    def parent(self, ensemble_id: Any) -> Optional[Any]:
+        return self._parents.get(ensemble_id)
+
+    def children(self, ensemble_id: Any) -> Tuple[Any, ...]:
+        return self._children.get(ensemble_id, ())
+
+    def chains(self) -> List[List[Any]]:
+        """Ensemble ids of every chain, from a prior to its last iteration"""
+        return [list(chain) for chain in self._chains]
+
+    def chain(self, ensemble_id: Any) -> List[Any]:
+        """
+        The chain through the ensemble, following the first child where
+        updates branch off
+        """
+        return list(self._chain_of.get(ensemble_id, [ensemble_id]))
+
+    def iteration(self, ensemble_id: Any) -> int:
+        """Number of updates between the prior and the ensemble"""
+        chain = self._chain_of.get(ensemble_id, [ensemble_id])
+        return chain.index(ensemble_id)
@@ -1,52 +1,63 @@
 import json
+import threading
 import pandas as pd
-from typing import Mapping, List, Dict, Union, Any, Optional
+from typing import Mapping, List, Dict, Union, Any, Optional, Set, Tuple, TYPE_CHECKING
 from webviz_ert.data_loader import get_data_loader, DataLoaderException
-from webviz_ert.models import Response, PriorModel, ParametersModel
+from webviz_ert.models import Response, PriorModel, ParametersModel, load_ensemble
+from webviz_ert.models.ensemble_entry import ensemble_name
+from webviz_ert.models.experiment_model import get_experiment
+
+if TYPE_CHECKING:
+    from webviz_ert.plugins._webviz_ert import WebvizErtPluginABC
 
 
 def _create_parameter_models(
     parameters_names: list,
-    priors: dict,
+    priors: Mapping[str, PriorModel],
     ensemble_id: str,
     project_id: str,
 ) -> Optional[Mapping[str, ParametersModel]]:
     parameters = {}
+    groups: Dict[str, List[ParametersModel]] = {}
     for param in parameters_names:
         key = param
-        prior_schema = priors.get(key, None)
-        prior = None
-        if prior_schema:
-            prior = PriorModel(
-                prior_schema["function"],
-                [x[0] for x in prior_schema.items() if isinstance(x[1], (float, int))],
-                [x[1] for x in prior_schema.items() if isinstance(x[1], (float, int))],
-            )
-
+        group, label = param.split("::", 1) if "::" in param else (param, None)
         parameters[key] = ParametersModel(
-            group="",  # TODO?
+            group=group,
+            label=label,
             key=key,
-            prior=prior,
+            prior=priors.get(key),
             param_id="",  # TODO?
             project_id=project_id,
             ensemble_id=ensemble_id,
         )
+        if label is not None:
+            groups.setdefault(group, []).append(parameters[key])
+    for siblings in groups.values():
+        for parameter in siblings:
+            parameter.set_siblings(siblings)
     return parameters
 
 
 class EnsembleModel:
-    def __init__(self, ensemble_id: str, project_id: str) -> None:
+    def __init__(
+        self,
+        ensemble_id: str,
+        project_id: str,
+        schema: Optional[Mapping[str, Any]] = None,
+        registry: Optional["WebvizErtPluginABC"] = None,
+    ) -> None:
         self._data_loader = get_data_loader(project_id)
-        self._schema = self._data_loader.get_ensemble(ensemble_id)
+        # Resolves parent and children to the registered models, if given
+        self._registry = registry
+        if schema is None:
+            schema = self._data_loader.get_ensemble(ensemble_id)
+        self._schema = schema
         self._experiment_id = self._schema["experiment"]["id"]
         self._project_id = project_id
+        self._experiment = get_experiment(self._experiment_id, project_id)
         self._metadata = json.loads(self._schema["userdata"])
-        if "name" in self._metadata:
-            self._name = self._metadata["name"]
-        else:
-            self._name = (
-                f"{self._schema['experiment']['name']}-{self._schema['timeCreated']}"
-            )
+        self._name = ensemble_name(self._schema, self._metadata)
         self._id = ensemble_id
         self._children = self._schema["children"]
         self._parent = self._schema["parent"]
@@ -57,89 +68,142 @@ class EnsembleModel:
         self._parameters: Optional[Mapping[str, ParametersModel]] = None
         self._cached_children: Optional[List["EnsembleModel"]] = None
         self._cached_parent: Optional["EnsembleModel"] = None
+        self._responses_lock = threading.Lock()
+        self._parameters_lock = threading.Lock()
+        self._lineage_lock = threading.Lock()
+        self._prefetched: Set[str] = set()
 
     @property
     def responses(self) -> Dict[str, Response]:
+        prefetcher = self._data_loader.prefetcher
         if not self._responses:
-            self._responses = {}
-            responses_dict = self._data_loader.get_ensemble_responses(self._id)
-            response_names = list(responses_dict.keys())
-            response_names.sort()
-
-            for name in response_names:
-                self._responses[name] = Response(
-                    name=name,
-                    ensemble_id=self._id,
-                    project_id=self._project_id,
-                    ensemble_size=self._size,
-                    active_realizations=self._active_realizations,
-                    resp_schema=responses_dict[name],
-                )
+            with self._responses_lock:
+                if not self._responses:
+                    self._responses = self._create_responses()
+                    prefetcher.track_load(self._prefetched, "responses")
+        prefetcher.track_use(self._prefetched, "responses")
         return self._responses
 
+    def _create_responses(self) -> Dict[str, Response]:
+        responses_dict = self._data_loader.get_ensemble_responses(self._id)
+        return {
+            name: Response(
+                name=name,
+                ensemble_id=self._id,
+                project_id=self._project_id,
+                ensemble_size=self._size,
+                active_realizations=self._active_realizations,
+                resp_schema=responses_dict[name],
+                experiment=self._experiment,
+            )
+            for name in sorted(responses_dict)
+        }
+
+    def _lineage(self) -> Tuple[Optional[Any], List[Any]]:
+        """
+        Ids of the parent and children, from the lineage of the registry's
+        catalogue when the ensemble is catalogued, else from its schema
+        """
+        if self._registry is not None:
+            lineage = self._registry.get_lineage()
+            if self._id in lineage:
+                return lineage.parent(self._id), list(lineage.children(self._id))
+        parent_id = self._parent["ensembleReference"]["id"] if self._parent else None
+        return parent_id, [child["ensembleResult"]["id"] for child in self._children]
+
+    def _relative(self, ensemble_id: str) -> "EnsembleModel":
+        if self._registry is not None:
+            return load_ensemble(self._registry, ensemble_id)
+        return EnsembleModel(ensemble_id=ensemble_id, project_id=self._project_id)
+
     @property
     def children(self) -> Optional[List["EnsembleModel"]]:
         if not self._cached_children:
-            self._cached_children = [
-                EnsembleModel(
-                    ensemble_id=child["ensembleResult"]["id"],
-                    project_id=self._project_id,
-                )
-                for child in self._children
-            ]
+            with self._lineage_lock:
+                if not self._cached_children:
+                    _, children_ids = self._lineage()
+                    self._cached_children = [
+                        self._relative(child_id) for child_id in children_ids
+                    ]
         return self._cached_children
 
     @property
     def parent(self) -> Optional["EnsembleModel"]:
-        if not self._parent:
-            return None
         if not self._cached_parent:
-            self._cached_parent = EnsembleModel(
-                ensemble_id=self._parent["ensembleReference"]["id"],
-                project_id=self._project_id,
-            )
+            parent_id, _ = self._lineage()
+            if parent_id is None:
+                return None
+            with self._lineage_lock:
+                if not self._cached_parent:
+                    self._cached_parent = self._relative(parent_id)
         return self._cached_parent
 
     @property
     def parameters(
         self,
     ) -> Optional[Mapping[str, ParametersModel]]:
+        prefetcher = self._data_loader.prefetcher
         if not self._parameters:
-            parameter_names = []
-            for params in self._data_loader.get_ensemble_parameters(self._id):
-                labels = params["labels"]
-                param_name = params["name"]
-                if len(labels) > 0:
-                    for label in labels:
-                        parameter_names.append(f"{param_name}::{label}")
-                else:
-                    parameter_names.append(param_name)
-            parameter_priors = (
-                self._data_loader.get_experiment_priors(self._experiment_id)
-                if not self._parent
-                else {}
-            )
-            self._parameters = _create_parameter_models(
-                parameter_names,
-                parameter_priors,
-                ensemble_id=self._id,
-                project_id=self._project_id,
-            )
+            with self._parameters_lock:
+                if not self._parameters:
+                    self._parameters = self._create_parameters()
+                    prefetcher.track_load(self._prefetched, "parameters")
+        prefetcher.track_use(self._prefetched, "parameters")
         return self._parameters
 
+    def _create_parameters(self) -> Optional[Mapping[str, ParametersModel]]:
+        parameter_names = []
+        for params in self._data_loader.get_ensemble_parameters(self._id):
+            labels = params["labels"]
+            param_name = params["name"]
+            if len(labels) > 0:
+                for label in labels:
+                    parameter_names.append(f"{param_name}::{label}")
+            else:
+                parameter_names.append(param_name)
+        parameter_priors = self._experiment.priors if not self._parent else {}
+        return _create_parameter_models(
+            parameter_names,
+            parameter_priors,
+            ensemble_id=self._id,
+            project_id=self._project_id,
+        )
+
     def parameters_df(self, parameter_list: Optional[List[str]] = None) -> pd.DataFrame:
         if not self.parameters or not parameter_list:
             return None
+        # Labelled parameters of the same group share one download
+        missing: Dict[str, ParametersModel] = {}
+        for parameter in parameter_list:
+            model = self.parameters[parameter]
+            if not model.is_loaded:
+                missing.setdefault(model.group, model)
+        self._data_loader.run_concurrently(
+            [model.data_df for model in missing.values()]
+        )
         data = {
             parameter: self.parameters[parameter].data_df().values.flatten()
             for parameter in parameter_list
         }
         return pd.DataFrame(data=data)
 
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes of response and parameter data currently held in memory"""
+        return self._data_loader.memory.resident_bytes().get(str(self._id), 0)
+
+    def evict_data(self) -> None:
+        """Drops the response and parameter data held in memory"""
+        self._data_loader.memory.evict_ensemble(self._id)
+
     @property
     def id(self) -> str:
         return self._id
 
+    @property
+    def project_id(self) -> str:
+        return self._project_id
+
     def __str__(self) -> str:
         if "." in self._time_created:
             return f"{self._time_created.split('.')[0]}, {self._name}"
@@ -0,0 +1,134 @@
+import logging
+import os
+import threading
+import weakref
+from typing import Callable, Dict, List, MutableMapping, Tuple, TypeVar
+from webviz_ert.data_loader import get_data_loader, DataLoader, DataLoaderException
+from webviz_ert.models import Observation, PriorModel
+from webviz_ert.models.observation import ObservationTable, fetch_observations
+from webviz_ert.models.parameter_model import create_prior_models
+
+logger = logging.getLogger()
+
+T = TypeVar("T")
+
+# Experiments of each DataLoader, so they live as long as its connection
+_experiments: "weakref.WeakKeyDictionary[DataLoader, Dict[str, ExperimentModel]]" = (
+    weakref.WeakKeyDictionary()
+)
+_experiments_lock = threading.Lock()
+
+
+class ExperimentModel:
+    """
+    Data that is the same for every ensemble of an experiment, the
+    observations of its responses and the parameter priors. It is fetched
+    and parsed once, by whichever ensemble asks first, and shared by
+    reference between the ensembles, see `get_experiment`.
+    """
+
+    def __init__(self, experiment_id: str, project_id: str) -> None:
+        self._id = experiment_id
+        # Not the DataLoader itself, which keys the experiments weakly
+        self._project_id = project_id
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._observations: Dict[str, List[Observation]] = {}
+        self._observation_tables: Dict[str, ObservationTable] = {}
+        self._priors: Dict[str, Dict[str, PriorModel]] = {}
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    def _load_once(
+        self, cache: MutableMapping[str, T], kind: str, key: str, load: Callable[[], T]
+    ) -> T:
+        """Loads a value once, unless `load` raises, then the next caller retries"""
+        if key in cache:
+            return cache[key]
+        with self._lock:
+            key_lock = self._key_locks.setdefault((kind, key), threading.Lock())
+        with key_lock:
+            if key not in cache:
+                cache[key] = load()
+        return cache[key]
+
+    def _load_observations(
+        self, record_name: str, ensemble_id: str
+    ) -> List[Observation]:
+        return self._load_once(
+            self._observations,
+            "observations",
+            record_name,
+            lambda: fetch_observations(
+                get_data_loader(self._project_id), ensemble_id, record_name, strict=True
+            ),
+        )
+
+    def observations(self, record_name: str, ensemble_id: str) -> List[Observation]:
+        """Observations of a response, fetched through `ensemble_id` if needed"""
+        try:
+            return self._load_observations(record_name, ensemble_id)
+        except DataLoaderException as e:
+            logger.error(e)
+            return []
+
+    def observation_table(self, record_name: str, ensemble_id: str) -> ObservationTable:
+        try:
+            return self._load_once(
+                self._observation_tables,
+                "observation_table",
+                record_name,
+                lambda: ObservationTable(
+                    self._load_observations(record_name, ensemble_id)
+                ),
+            )
+        except DataLoaderException as e:
+            logger.error(e)
+            return ObservationTable([])
+
+    @property
+    def priors(self) -> Dict[str, PriorModel]:
+        """Prior of every parameter with one, by parameter key"""
+        try:
+            return self._load_once(
+                self._priors,
+                "priors",
+                "",
+                lambda: create_prior_models(
+                    get_data_loader(self._project_id).get_experiment_priors(
+                        self._id, strict=True
+                    )
+                ),
+            )
+        except RuntimeError as e:
+            logger.error(e)
+            return {}
+
+
+def get_experiment(experiment_id: str, project_id: str) -> ExperimentModel:
+    """The one model of an experiment, shared by all its ensembles"""
+    data_loader = get_data_loader(project_id)
+    with _experiments_lock:
+        experiments = _experiments.setdefault(data_loader, {})
+        if experiment_id not in experiments:
+            experiments[experiment_id] = ExperimentModel(experiment_id, project_id)
+        return experiments[experiment_id]
+
+
+def clear_experiments() -> None:
+    """Drops the experiment models, so their data is fetched again"""
+    with _experiments_lock:
+        _experiments.clear()
+
+
+def _reset_after_fork() -> None:
+    """Forked processes start without experiments, which use the parent's loaders"""
+    global _experiments, _experiments_lock
+    _experiments = weakref.WeakKeyDictionary()
+    _experiments_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,68 @@
+from typing import List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from webviz_ert.models import Observation
+from webviz_ert.models.observation import ObservationTable
+
+
+def _comparable_axis(values: Sequence) -> pd.Index:
+    """
+    Normalises an x-axis so that response indexes and observation x-axes
+    given as numbers, numeric strings or ISO dates can be matched
+    """
+    index = pd.Index(values)
+    if index.dtype.kind in "iufM":
+        return index
+    try:
+        return pd.Index(pd.to_numeric(index))
+    except (ValueError, TypeError):
+        pass
+    try:
+        return pd.Index(pd.to_datetime(index))
+    except (ValueError, TypeError):
+        return index
+
+
+def _realization_index(columns: pd.Index) -> pd.Index:
+    try:
+        return columns.astype(int)
+    except (ValueError, TypeError):
+        return columns
+
+
+def univariate_misfits(
+    data: pd.DataFrame, observations: Union[List[Observation], ObservationTable]
+) -> Optional[pd.DataFrame]:
+    """
+    Signed univariate misfits, ((response - observation) / std)^2 carrying
+    the sign of the difference, for every realization (rows) and observed
+    x-axis point (columns), as computed by ERT storage's `compute/misfits`.
+
+    Returns None when the response does not cover every observed point.
+    """
+    table = (
+        observations
+        if isinstance(observations, ObservationTable)
+        else ObservationTable(observations)
+    )
+    if data.empty or not len(table):
+        return None
+    positions = _comparable_axis(data.index).get_indexer(_comparable_axis(table.x_axis))
+    if (positions < 0).any():
+        return None
+
+    observed = table.values[:, np.newaxis]
+    std = table.std[:, np.newaxis]
+    difference = data.values[positions, :] - observed
+    misfits = (difference / std) ** 2 * np.sign(difference)
+    return pd.DataFrame(
+        misfits.T,
+        index=_realization_index(data.columns),
+        columns=table.x_labels,
+    )
+
+
+def summary_misfits(univariate_misfits_df: pd.DataFrame) -> pd.DataFrame:
+    """Sum of the absolute univariate misfits of each realization"""
+    return pd.DataFrame({"0": univariate_misfits_df.abs().sum(axis=1)})
@@ -1,5 +1,7 @@
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
+from webviz_ert.data_loader import DataLoader
 from webviz_ert.models import indexes_to_axis
 
 
@@ -11,18 +13,100 @@ class Observation:
         self._values = observation_schema["values"]
         self._attributes = ""
         self._active = [True for _ in self._x_axis]
+        # (x-axis, parsed x-axis), parsed again if the x-axis is replaced
+        self._parsed_x_axis: Optional[Tuple[List, Optional[Sequence]]] = None
 
         if "attributes" in observation_schema:
             for k, v in observation_schema["attributes"].items():
                 self._attributes += f"{k}: {v}<br>"
 
+    @property
+    def x_axis(self) -> List:
+        return self._x_axis
+
+    @property
+    def parsed_x_axis(self) -> Optional[Sequence]:
+        """The x-axis with dates parsed, see `indexes_to_axis`"""
+        parsed = self._parsed_x_axis
+        if parsed is None or parsed[0] is not self._x_axis:
+            parsed = self._parsed_x_axis = (
+                self._x_axis,
+                indexes_to_axis(self._x_axis),
+            )
+        return parsed[1]
+
     def data_df(self) -> pd.DataFrame:
         return pd.DataFrame(
             data={
                 "values": self._values,
                 "std": self._std,
-                "x_axis": indexes_to_axis(self._x_axis),
+                "x_axis": self.parsed_x_axis,
                 "attributes": self._attributes,
                 "active": self._active,
             }
         )
+
+
+def fetch_observations(
+    data_loader: DataLoader, ensemble_id: str, record_name: str, strict: bool = False
+) -> List[Observation]:
+    return [
+        Observation(observation_schema=observation_schema)
+        for observation_schema in data_loader.get_ensemble_record_observations(
+            ensemble_id, record_name, strict=strict
+        )
+    ]
+
+
+class ObservationTable:
+    """
+    The observations of a response as columns: values, std, parsed x-axis,
+    active mask, attributes and observation key of every observed point,
+    held in numpy arrays and built once, in the order of the observations.
+    """
+
+    def __init__(self, observations: List[Observation]) -> None:
+        lengths = [len(obs.x_axis) for obs in observations]
+        self.values = np.array(
+            [value for obs in observations for value in obs._values], dtype=float
+        )
+        self.std = np.array(
+            [std for obs in observations for std in obs._std], dtype=float
+        )
+        self.active = np.array(
+            [active for obs in observations for active in obs._active], dtype=bool
+        )
+        self.key = np.repeat(
+            np.array([obs.name for obs in observations], dtype=object), lengths
+        )
+        self.attributes = np.repeat(
+            np.array([obs._attributes for obs in observations], dtype=object),
+            lengths,
+        )
+        axes = [pd.Index(obs.parsed_x_axis) for obs in observations]
+        self.x_axis: pd.Index = axes[0].append(axes[1:]) if axes else pd.Index([])
+        # The x-axis values as given, labelling the points in misfits
+        self.x_labels = [str(x) for obs in observations for x in obs.x_axis]
+        self._data_df: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def data_df(self) -> pd.DataFrame:
+        """
+        The table as a frame shaped like `Observation.data_df`, with an
+        additional `key` column. It is built once and shared, so it must
+        not be modified.
+        """
+        if self._data_df is None:
+            self._data_df = pd.DataFrame(
+                data={
+                    "values": self.values,
+                    "std": self.std,
+                    "x_axis": self.x_axis,
+                    "attributes": self.attributes,
+                    "active": self.active,
+                    "key": self.key,
+                }
+            )
+        return self._data_df
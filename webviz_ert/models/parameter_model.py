@@ -1,6 +1,7 @@
+import threading
 import pandas as pd
-from typing import List, Any, Optional, Union
-from webviz_ert.data_loader import get_data_loader
+from typing import Dict, List, Any, Mapping, Optional, Union
+from webviz_ert.data_loader import get_data_loader, frame_bytes
 
 
 class PriorModel:
@@ -15,6 +16,19 @@ class PriorModel:
         self.function_parameter_values = function_parameter_values
 
 
+def create_prior_models(priors: Mapping[str, Any]) -> Dict[str, PriorModel]:
+    """Parses the prior schemas of an experiment, by parameter key"""
+    return {
+        key: PriorModel(
+            prior_schema["function"],
+            [x[0] for x in prior_schema.items() if isinstance(x[1], (float, int))],
+            [x[1] for x in prior_schema.items() if isinstance(x[1], (float, int))],
+        )
+        for key, prior_schema in priors.items()
+        if prior_schema
+    }
+
+
 class ParametersModel:
     def __init__(self, **kwargs: Any):
         self._project_id = kwargs["project_id"]
@@ -24,16 +38,66 @@ class ParametersModel:
         self._id = kwargs["param_id"]
         self._ensemble_id = kwargs["ensemble_id"]
         self._realizations = kwargs.get("realizations")
+        self.label: Optional[str] = kwargs.get("label")
         self._data_df = pd.DataFrame()
         self._data_loader = get_data_loader(self._project_id)
+        self._siblings: List["ParametersModel"] = [self]
+        self._group_fetched = False
+        # Shared by all labels of a group, so the group is fetched only once
+        self._lock = threading.Lock()
+
+    def set_siblings(self, siblings: List["ParametersModel"]) -> None:
+        """
+        Registers the models holding the other labels of the same record
+        group, so that fetching one label populates all of them
+        """
+        self._siblings = siblings
+        self._lock = siblings[0]._lock
+
+    @property
+    def is_loaded(self) -> bool:
+        return not self._data_df.empty
+
+    def _load_group(self) -> None:
+        group_df = self._data_loader.get_ensemble_parameter_group_data(
+            ensemble_id=self._ensemble_id,
+            group_name=self.group,
+        )
+        for sibling in self._siblings:
+            sibling._group_fetched = True
+            if sibling.label in group_df.columns and not sibling.is_loaded:
+                # Renamed on a copy, the index is shared with the group
+                sibling._set_data_df(group_df[[sibling.label]].rename_axis(sibling.key))
+
+    def _set_data_df(self, data_df: pd.DataFrame) -> None:
+        self._data_df = data_df
+        self._data_loader.memory.charge(
+            self, "data", self._ensemble_id, frame_bytes(data_df)
+        )
+
+    def evict(self, name: str) -> None:
+        """Drops the loaded values, see `MemoryBudget`"""
+        self._data_df = pd.DataFrame()
+        self._group_fetched = False
 
     def data_df(self) -> pd.DataFrame:
+        data_df = self._data_df
+        if data_df.empty:
+            with self._lock:
+                self._load()
+                data_df = self._data_df
+        else:
+            self._data_loader.memory.touch(self, "data")
+        return data_df
+
+    def _load(self) -> None:
+        if self._data_df.empty and self.label is not None and not self._group_fetched:
+            self._load_group()
         if self._data_df.empty:
             _data_df = self._data_loader.get_ensemble_parameter_data(
                 ensemble_id=self._ensemble_id,
                 parameter_name=self.key,
             )
             if _data_df is not None:
-                _data_df.index.name = self.key
-                self._data_df = _data_df
-        return self._data_df
+                # The fetched frame is shared with other callers
+                self._set_data_df(_data_df.rename_axis(self.key))
@@ -1,9 +1,43 @@
-from typing import List, Mapping, Optional, Any, Union, Dict
+from typing import (
+    List,
+    Mapping,
+    Optional,
+    Any,
+    Union,
+    Dict,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+)
 import datetime
+import math
+import threading
 import pandas as pd
-from webviz_ert.data_loader import get_data_loader, DataLoader
+from webviz_ert.data_loader import get_data_loader, DataLoader, frame_bytes
 
 from webviz_ert.models import Realization, Observation, indexes_to_axis
+from webviz_ert.models.observation import ObservationTable, fetch_observations
+from webviz_ert.models.misfits import (
+    univariate_misfits,
+    summary_misfits,
+    _comparable_axis,
+)
+
+if TYPE_CHECKING:
+    from webviz_ert.models.experiment_model import ExperimentModel
+
+# Largest fraction of the x-axis fetched as a projection. Every x-axis value
+# is a column chunk of its own, so wider windows are cheaper to load whole.
+PROJECTION_MAX_FRACTION = 0.1
+
+
+def _window_bound(axis: pd.Index, value: Any) -> Any:
+    """Converts a window bound, e.g. from a plotly axis range, to the axis type"""
+    if axis.dtype.kind == "M":
+        return pd.Timestamp(value)
+    if axis.dtype.kind in "iuf":
+        return float(value)
+    return value
 
 
 class Response:
@@ -15,19 +49,33 @@ class Response:
         ensemble_size: int,
         active_realizations: List[int],
         resp_schema: Any,
+        experiment: Optional["ExperimentModel"] = None,
     ):
         self._data_loader: DataLoader = get_data_loader(project_id)
+        # Shares the observations with the other ensembles of the experiment
+        self._experiment = experiment
         self._document: Optional[Mapping[str, Any]] = None
         self._id: str = resp_schema["id"]
         self._ensemble_id: str = ensemble_id
         self.name: str = name
         self._data: Optional[pd.DataFrame] = None
+        self._data_at: Dict[int, pd.Series] = {}
+        self._axis_index: Optional[pd.Index] = None
+        self._window: Optional[Tuple[Tuple[int, int, int], pd.DataFrame]] = None
         self._observations: Optional[List[Observation]] = None
+        self._observation_table: Optional[ObservationTable] = None
         self._univariate_misfits_df: Optional[pd.DataFrame] = None
         self._summary_misfits_df: Optional[pd.DataFrame] = None
         self._ensemble_size: int = ensemble_size
         self._active_realizations: List[int] = active_realizations
         self._has_observations: bool = resp_schema.get("has_observations")
+        # Callbacks run concurrently, the locks make the lazy properties
+        # below populate exactly once
+        self._data_lock = threading.Lock()
+        self._observations_lock = threading.Lock()
+        self._misfits_lock = threading.Lock()
+        self._prefetched: Set[str] = set()
+        self._viewed = False
 
     @property
     def ensemble_id(self) -> str:
@@ -39,50 +87,252 @@ class Response:
 
     @property
     def data(self) -> pd.DataFrame:
-        if self._data is None:
-            self._data = self._data_loader.get_ensemble_record_data(
-                self._ensemble_id, self.name
+        self._record_view()
+        prefetcher = self._data_loader.prefetcher
+        data = self._data
+        if data is None:
+            with self._data_lock:
+                data = self._data
+                if data is None:
+                    data = self._data = self._data_loader.get_ensemble_record_data(
+                        self._ensemble_id, self.name
+                    )
+                    self._charge("data", data)
+                    prefetcher.track_load(self._prefetched, "data")
+        else:
+            self._data_loader.memory.touch(self, "data")
+        prefetcher.track_use(self._prefetched, "data")
+        return data
+
+    def _set_data(self, data: pd.DataFrame) -> None:
+        with self._data_lock:
+            if self._data is None:
+                self._data = data
+                self._charge("data", data)
+
+    def _charge(self, name: str, *frames: Optional[Any]) -> None:
+        """Accounts for the memory of loaded data, see `evict`"""
+        self._data_loader.memory.charge(
+            self, name, self._ensemble_id, sum(frame_bytes(frame) for frame in frames)
+        )
+
+    def evict(self, name: str) -> None:
+        """Drops loaded data, see `MemoryBudget`"""
+        if name == "data":
+            self._data = None
+        elif name == "data_at":
+            self._data_at = {}
+        elif name == "window":
+            self._window = None
+        elif name == "misfits":
+            self._univariate_misfits_df = None
+            self._summary_misfits_df = None
+
+    def _record_view(self) -> None:
+        """Counts the response as viewed, for prefetching popular responses"""
+        prefetcher = self._data_loader.prefetcher
+        if not self._viewed and not prefetcher.is_prefetching():
+            self._viewed = True
+            prefetcher.record_view(self.name)
+
+    def _compute_misfits(self, summary: bool) -> pd.DataFrame:
+        """
+        Computes misfits locally from the response data and its observations,
+        only asking the server when they cannot be aligned
+        """
+        univariate = self._univariate_misfits_df
+        if univariate is None and self.observations:
+            univariate = univariate_misfits(self.data, self.observation_table)
+        if univariate is None:
+            return self._data_loader.compute_misfit(
+                self._ensemble_id, self.name, summary=summary
             )
-        return self._data
+        return summary_misfits(univariate) if summary else univariate
 
     def univariate_misfits_df(
         self, selection: Optional[List[int]] = None
     ) -> pd.DataFrame:
-        if self._univariate_misfits_df is None:
-            self._univariate_misfits_df = self._data_loader.compute_misfit(
-                self._ensemble_id, self.name, summary=False
-            )
+        misfits = self._univariate_misfits_df
+        if misfits is None:
+            with self._misfits_lock:
+                misfits = self._univariate_misfits_df
+                if misfits is None:
+                    misfits = self._compute_misfits(summary=False)
+                    self._univariate_misfits_df = misfits
+                    self._charge_misfits()
+        else:
+            self._data_loader.memory.touch(self, "misfits")
         if selection:
-            return self._univariate_misfits_df.iloc[selection, :]
-        return self._univariate_misfits_df
+            return misfits.iloc[selection, :]
+        return misfits
 
     def summary_misfits_df(self, selection: Optional[List[int]] = None) -> pd.DataFrame:
-        if self._summary_misfits_df is None:
-            self._summary_misfits_df = self._data_loader.compute_misfit(
-                self._ensemble_id, self.name, summary=True
-            )
+        misfits = self._summary_misfits_df
+        if misfits is None:
+            with self._misfits_lock:
+                misfits = self._summary_misfits_df
+                if misfits is None:
+                    misfits = self._compute_misfits(summary=True)
+                    self._summary_misfits_df = misfits
+                    self._charge_misfits()
+        else:
+            self._data_loader.memory.touch(self, "misfits")
         if selection:
-            self._summary_misfits_df.iloc[selection, :]
-        return self._summary_misfits_df
+            return misfits.iloc[selection, :]
+        return misfits
+
+    def _charge_misfits(self) -> None:
+        self._charge("misfits", self._univariate_misfits_df, self._summary_misfits_df)
+
+    @property
+    def _projected(self) -> bool:
+        """Whether parts of the response are fetched instead of all of it"""
+        return self._data is None and self._data_loader.supports_projection
+
+    def _project(self) -> bool:
+        """
+        Whether parts of the response are fetched, checked again once the
+        footer is read, as servers not supporting range requests send all
+        of it instead
+        """
+        if self._projected:
+            self.axis_index
+        return self._projected
 
     def data_df(self, selection: Optional[List[int]] = None) -> pd.DataFrame:
-        if selection:
-            self.data.iloc[selection, :]
-        return self.data
+        """
+        Response values with one row per x-axis index and one column per
+        realization, limited to the realizations at the positions in
+        `selection`. When the whole response is not loaded, only the
+        selected realizations are fetched.
+        """
+        if not selection:
+            return self.data
+        if self._project():
+            return self._data_loader.get_ensemble_record_projection(
+                self._ensemble_id, self.name, realizations=selection
+            )
+        return self.data.iloc[:, selection]
+
+    def data_at(self, x_index: int) -> pd.Series:
+        """
+        Values of every realization at one position of the x-axis, fetching
+        only that part of the response when it is not loaded
+        """
+        self._record_view()
+        if not self._project():
+            data = self.data
+            if not -len(data.index) <= x_index < len(data.index):
+                # Also when the record failed to load, as an empty frame
+                return pd.Series(dtype=float)
+            return data.iloc[x_index]
+        if not -len(self.axis_index) <= x_index < len(self.axis_index):
+            return pd.Series(dtype=float)
+        data_at = self._data_at
+        if x_index in data_at:
+            self._data_loader.memory.touch(self, "data_at")
+            return data_at[x_index]
+        df = self._data_loader.get_ensemble_record_projection(
+            self._ensemble_id, self.name, x_indexes=[x_index]
+        )
+        if df.empty:
+            return pd.Series(dtype=float)
+        data_at[x_index] = df.iloc[0]
+        self._charge("data_at", *data_at.values())
+        return data_at[x_index]
+
+    @property
+    def axis_index(self) -> pd.Index:
+        """
+        Sorted x-axis as numbers or datetimes, for finding window bounds by
+        binary search. Read from the record footer when the response is not
+        loaded.
+        """
+        if self._axis_index is None:
+            if self._projected:
+                axis, data = self._data_loader.get_ensemble_record_axis(
+                    self._ensemble_id, self.name
+                )
+                if data is not None:
+                    self._set_data(data)
+            else:
+                axis = self.data.index
+            self._axis_index = _comparable_axis(axis)
+        return self._axis_index
+
+    def data_window(
+        self, start: Any = None, end: Any = None, max_points: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Response values at the x-axis values from `start` to `end`, both
+        included, given as indexes or dates; None leaves that side open.
+
+        With `max_points` the window is thinned out to at most that many
+        evenly spaced x-axis values, so an overview of a long response is
+        cheap and zooming in fetches finer data for the zoomed range only.
+        """
+        self._record_view()
+        axis = self.axis_index
+        first = 0 if start is None else axis.searchsorted(_window_bound(axis, start))
+        stop = (
+            len(axis)
+            if end is None
+            else axis.searchsorted(_window_bound(axis, end), side="right")
+        )
+        step = max(1, math.ceil((stop - first) / max_points)) if max_points else 1
+        selected = len(range(first, stop, step))
+        # Not projected either once the axis was read from a whole record,
+        # sent by servers not supporting range requests
+        if not self._projected or selected > PROJECTION_MAX_FRACTION * len(axis):
+            return self.data.iloc[first:stop:step]
+        if first >= stop:
+            return pd.DataFrame()
+        key = (first, stop, step)
+        window = self._window
+        if window is None or window[0] != key:
+            df = self._data_loader.get_ensemble_record_projection(
+                self._ensemble_id, self.name, x_indexes=range(first, stop, step)
+            )
+            window = self._window = (key, df)
+            self._charge("window", df)
+        else:
+            self._data_loader.memory.touch(self, "window")
+        return window[1]
 
     @property
     def observations(self) -> Optional[List[Observation]]:
+        prefetcher = self._data_loader.prefetcher
         if self._observations is None:
-            _observations_schemas = self._data_loader.get_ensemble_record_observations(
-                self._ensemble_id, self.name
-            )
-            self._observations = []
-            for observation_schema in _observations_schemas:
-                self._observations.append(
-                    Observation(observation_schema=observation_schema)
-                )
+            with self._observations_lock:
+                if self._observations is None:
+                    if self._experiment is not None:
+                        self._observations = self._experiment.observations(
+                            self.name, self._ensemble_id
+                        )
+                    else:
+                        self._observations = fetch_observations(
+                            self._data_loader, self._ensemble_id, self.name
+                        )
+                    prefetcher.track_load(self._prefetched, "observations")
+        prefetcher.track_use(self._prefetched, "observations")
         return self._observations
 
+    @property
+    def observation_table(self) -> ObservationTable:
+        """All the observations of the response as one columnar table"""
+        table = self._observation_table
+        if table is None and self._experiment is not None:
+            table = self._observation_table = self._experiment.observation_table(
+                self.name, self._ensemble_id
+            )
+        if table is None:
+            observations = self.observations or []
+            with self._observations_lock:
+                table = self._observation_table
+                if table is None:
+                    table = self._observation_table = ObservationTable(observations)
+        return table
+
     @property
     def has_observations(self) -> bool:
         return self._has_observations
@@ -1,15 +1,41 @@
-from typing import MutableMapping, Optional
+import os
+import threading
+from typing import List, MutableMapping, Optional
 import dash
+import flask
 from webviz_config import WebvizPluginABC
-from webviz_ert.models import EnsembleModel
+from webviz_ert.data_loader import metrics_exposition, start_metrics_log
+from webviz_ert.models import (
+    EnsembleEntry,
+    EnsembleModel,
+    LineageIndex,
+    clear_experiments,
+)
+
+
+def _register_metrics(app: dash.Dash) -> None:
+    """Serves the data loader metrics on `/metrics`, once per server"""
+    if "webviz_ert_metrics" not in app.server.view_functions:
+        app.server.add_url_rule(
+            "/metrics",
+            "webviz_ert_metrics",
+            lambda: flask.Response(
+                metrics_exposition(), mimetype="text/plain; version=0.0.4"
+            ),
+        )
+    start_metrics_log()
 
 
 class WebvizErtPluginABC(WebvizPluginABC):
     _ensembles: MutableMapping[str, "EnsembleModel"] = {}
+    _ensembles_lock = threading.Lock()
+    _catalogue: MutableMapping[str, "EnsembleEntry"] = {}
+    _lineage = LineageIndex([])
 
     def __init__(self, app: dash.Dash, project_identifier: str):
         super().__init__()
         self.project_identifier: str = project_identifier
+        _register_metrics(app)
 
     @classmethod
     def get_ensembles(cls) -> MutableMapping[str, "EnsembleModel"]:
@@ -20,10 +46,50 @@ class WebvizErtPluginABC(WebvizPluginABC):
         return cls._ensembles.get(ensemble_id)
 
     @classmethod
-    def add_ensemble(cls, ensemble: "EnsembleModel") -> None:
-        if ensemble.id not in cls._ensembles:
-            cls._ensembles[ensemble.id] = ensemble
+    def add_ensemble(cls, ensemble: "EnsembleModel") -> "EnsembleModel":
+        """
+        Registers the ensemble unless one with the same id already is,
+        returning the registered one
+        """
+        with cls._ensembles_lock:
+            return cls._ensembles.setdefault(ensemble.id, ensemble)
 
     @classmethod
     def clear_ensembles(cls) -> None:
-        cls._ensembles.clear()
+        with cls._ensembles_lock:
+            for ensemble in cls._ensembles.values():
+                ensemble.evict_data()
+            cls._ensembles.clear()
+            cls._catalogue.clear()
+            cls._lineage = LineageIndex([])
+        clear_experiments()
+
+    @classmethod
+    def get_catalogue(cls) -> MutableMapping[str, "EnsembleEntry"]:
+        return cls._catalogue
+
+    @classmethod
+    def set_catalogue(cls, entries: List["EnsembleEntry"]) -> None:
+        with cls._ensembles_lock:
+            cls._catalogue.clear()
+            cls._catalogue.update((entry.id, entry) for entry in entries)
+            cls._lineage = LineageIndex(entries)
+
+    @classmethod
+    def get_lineage(cls) -> LineageIndex:
+        return cls._lineage
+
+
+def _reset_after_fork() -> None:
+    """
+    Forked processes start with an empty registry, as its models use the
+    parent's loaders
+    """
+    WebvizErtPluginABC._ensembles = {}
+    WebvizErtPluginABC._ensembles_lock = threading.Lock()
+    WebvizErtPluginABC._catalogue = {}
+    WebvizErtPluginABC._lineage = LineageIndex([])
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)